@@ -0,0 +1,323 @@
+"""
+Barge-in fast path: stop talking as soon as the caller talks over the agent.
+
+By default AgentSession only interrupts after min_interruption_duration (0.5s)
+of caller speech, and it clears the room audio output only after the LLM and
+TTS tasks have been cancelled. Until then, everything the TTS has already
+synthesized (usually most of the reply, since TTS runs faster than realtime)
+keeps playing from the audio source queue.
+
+PacedAudioOutput keeps that queue in Python and hands frames to the room just
+ahead of playout, so it can be paused or dropped at once. BargeInMonitor pauses
+the agent the moment VAD reports the caller speaking, and leaves the decision
+to AgentSession's min_interruption_duration (set short, e.g. 0.2s, with the
+fast path). If the session interrupts the reply, the queued audio is dropped,
+the pending LLM/TTS streams and queued replies are cancelled, and AgentSession
+writes the truncated reply back to the chat context. If it doesn't (a cough, an
+"mm-hmm"), the paused audio resumes. It also logs stop latency and
+generated-but-never-spoken tokens per interruption.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterable, Optional
+
+from livekit import rtc
+from livekit.agents import AgentSession, llm
+from livekit.agents.voice import SpeechHandle, io
+
+logger = logging.getLogger("barge-in")
+
+CONFIRM_GRACE = 0.15  # VAD frame latency on top of min_interruption_duration
+
+
+class PacedAudioOutput(io.AudioOutput):
+    """
+    Audio output that releases frames to the next sink at most `lead` seconds
+    ahead of playout, so queued agent audio can be paused or dropped instantly
+    """
+
+    def __init__(self, next_in_chain: io.AudioOutput, *, lead: float = 0.1):
+        super().__init__(
+            label="PacedAudio",
+            next_in_chain=next_in_chain,
+            sample_rate=next_in_chain.sample_rate,
+        )
+        self.lead = lead
+        self._next = next_in_chain
+        self._frames: deque[Optional[rtc.AudioFrame]] = deque()  # None marks a flush
+        self._wakeup = asyncio.Event()
+        self._pump_task: Optional[asyncio.Task] = None
+        self._released_until = 0.0  # monotonic time the released audio finishes playing
+        self._paused = False
+        self.dropped_audio = 0.0  # seconds of the current/last segment never released
+
+        # Current segment: captured, partly handed on, or being discarded after a drop
+        self._capturing = False
+        self._open = False
+        self._forwarded = False
+        self._discarding = False
+
+    def queued_ahead(self) -> float:
+        """Seconds of released audio the next sink has yet to play"""
+        return max(self._released_until - time.monotonic(), 0.0)
+
+    async def capture_frame(self, frame: rtc.AudioFrame) -> None:
+        await super().capture_frame(frame)
+        self._capturing = True
+        if self._discarding:
+            return
+        if self._pump_task is None:
+            self._pump_task = asyncio.create_task(self._pump())
+        if not self._open:
+            self.dropped_audio = 0.0
+        self._open = True
+        self._frames.append(frame)
+        self._wakeup.set()
+
+    def flush(self) -> None:
+        super().flush()
+        self._capturing = False
+        if self._discarding:
+            self._discarding = False
+        elif self._open:
+            self._frames.append(None)
+            self._wakeup.set()
+
+    def pause(self) -> None:
+        """Stop releasing frames; what was already released still plays (at most `lead`)"""
+        self._paused = True
+
+    def resume(self) -> None:
+        self._paused = False
+        self._wakeup.set()
+
+    def clear_buffer(self) -> None:
+        self._paused = False
+        self.dropped_audio += sum(f.duration for f in self._frames if f is not None)
+        self._frames.clear()
+        if self._open:
+            self._finish_segment(interrupted=True)
+            self._discarding = self._capturing
+        else:
+            self._next.clear_buffer()
+
+    def drop_pending(self) -> float:
+        """Drop audio not yet released and the rest of this segment; returns seconds dropped"""
+        dropped = sum(f.duration for f in self._frames if f is not None)
+        self.dropped_audio += dropped
+        flush_pending = bool(self._frames) and self._frames[-1] is None
+        self._frames.clear()
+        if flush_pending:
+            self._frames.append(None)
+        self._discarding = self._capturing
+        self.resume()
+        return dropped
+
+    async def aclose(self) -> None:
+        if self._pump_task:
+            self._pump_task.cancel()
+
+    def _finish_segment(self, *, interrupted: bool) -> None:
+        if self._forwarded:
+            # The next sink reports playback_finished, which the chain relays to us
+            self._next.flush()
+            if interrupted:
+                self._next.clear_buffer()
+        else:
+            self.on_playback_finished(playback_position=0.0, interrupted=interrupted)
+        self._open = self._forwarded = False
+
+    async def _pump(self) -> None:
+        while True:
+            if self._paused or not self._frames:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            if self._frames[0] is None:
+                self._frames.popleft()
+                self._finish_segment(interrupted=False)
+                continue
+
+            ahead = self.queued_ahead()
+            if ahead > self.lead:
+                await asyncio.sleep(ahead - self.lead)
+                continue  # the queue may have been paused or dropped meanwhile
+
+            frame = self._frames.popleft()
+            self._released_until = max(self._released_until, time.monotonic()) + frame.duration
+            self._forwarded = True
+            await self._next.capture_frame(frame)
+
+
+@dataclass
+class Interruption:
+    speech_id: str
+    stop_latency: Optional[float]  # caller speech detected -> agent audio stopped
+    generated_tokens: int
+    wasted_tokens: int  # generated but never spoken
+    dropped_audio: float  # seconds of synthesized audio never played
+
+
+class BargeInMonitor:
+    """
+    Pause the agent on the first caller speech (fast path), drop or resume the
+    audio once AgentSession has decided, and log stop latency and wasted tokens
+    for every interruption
+    """
+
+    def __init__(self, session: AgentSession, output: io.AudioOutput, fast_path: bool = True):
+        self.session = session
+        self.output = output  # head of the session's audio output chain
+        self.fast_path = fast_path and isinstance(output, PacedAudioOutput)
+        self.interruptions: list[Interruption] = []
+        self.false_starts = 0
+        self._replies: list[SpeechHandle] = []  # LLM replies in creation order, not done yet
+        self._generated: dict[str, tuple[int, str]] = {}  # speech_id -> (tokens, text)
+        self._spoken: dict[str, str] = {}  # message id -> truncated text kept in the chat context
+        self._caller_started_at: Optional[float] = None
+        self._stop_at: Optional[float] = None
+        self._last_stop_latency: Optional[float] = None
+        self._confirm_task: Optional[asyncio.Task] = None
+
+    def attach(self) -> None:
+        self.session.on("user_state_changed", self._on_user_state_changed)
+        self.session.on("speech_created", self._on_speech_created)
+        self.session.on("conversation_item_added", self._on_conversation_item_added)
+        self.output.on("playback_finished", self._on_playback_finished)
+
+    async def track_generation(self, stream: AsyncIterable) -> AsyncIterable:
+        """Pass llm_node output through, counting tokens per speech (one per streamed delta)"""
+        # llm_node runs right after its reply's speech_created (or again for a
+        # tool response, on the same handle), so the newest open reply is ours
+        speech = self._replies[-1] if self._replies else None
+        async for chunk in stream:
+            if isinstance(chunk, llm.ChatChunk):
+                text = chunk.delta.content if chunk.delta else None
+            else:
+                text = chunk if isinstance(chunk, str) else None
+            if speech and text:
+                tokens, generated = self._generated.get(speech.id, (0, ""))
+                self._generated[speech.id] = (tokens + 1, generated + text)
+            yield chunk
+
+    def _on_user_state_changed(self, ev) -> None:
+        if ev.new_state == "listening":
+            speech = self.session.current_speech
+            if speech is None or not speech.interrupted:
+                self._caller_started_at = None  # spoke without interrupting the agent
+            return
+        if ev.new_state != "speaking":
+            return
+        self._caller_started_at = time.monotonic()
+
+        speech = self.session.current_speech
+        if not (
+            self.fast_path
+            and self.session.agent_state in ("speaking", "thinking")
+            and speech is not None
+            and speech.allow_interruptions
+            and not speech.interrupted
+        ):
+            return
+
+        # Pause first: what is already released stops within `lead`
+        self.output.pause()
+        self._stop_at = time.monotonic() + self.output.queued_ahead()
+        if self._confirm_task:
+            self._confirm_task.cancel()
+        self._confirm_task = asyncio.create_task(self._confirm(speech))
+
+    async def _confirm(self, speech: SpeechHandle) -> None:
+        """Drop the paused reply if AgentSession interrupts it, resume it otherwise"""
+        paused_at = time.monotonic()
+        deadline = paused_at + self.session.options.min_interruption_duration + CONFIRM_GRACE
+        while not (speech.interrupted or speech.done()) and time.monotonic() < deadline:
+            await asyncio.sleep(0.02)
+
+        if speech.interrupted:
+            if not speech.done():
+                self.output.drop_pending()
+                self.session.interrupt()  # also cancels queued replies and preemptive generation
+            return
+
+        self.output.resume()
+        if not speech.done():
+            self.false_starts += 1
+            self._caller_started_at = self._stop_at = None
+            logger.info(f"False start, resumed after {(time.monotonic() - paused_at) * 1000:.0f}ms")
+
+    def _on_playback_finished(self, ev: io.PlaybackFinishedEvent) -> None:
+        if not ev.interrupted:
+            return
+        stop_at = min(self._stop_at or time.monotonic(), time.monotonic())
+        if self._caller_started_at is not None:
+            self._last_stop_latency = max(stop_at - self._caller_started_at, 0.0)
+        self._caller_started_at = self._stop_at = None
+
+    def _on_conversation_item_added(self, ev) -> None:
+        item = ev.item
+        if isinstance(item, llm.ChatMessage) and item.role == "assistant" and item.interrupted:
+            self._spoken[item.id] = item.text_content or ""
+
+    def _on_speech_created(self, ev) -> None:
+        if ev.source != "say":
+            self._replies.append(ev.speech_handle)
+        ev.speech_handle.add_done_callback(self._on_speech_done)
+
+    def _on_speech_done(self, speech: SpeechHandle) -> None:
+        if speech in self._replies:
+            self._replies.remove(speech)
+        tokens, generated = self._generated.pop(speech.id, (0, ""))
+        if not speech.interrupted:
+            return
+
+        # With the fast path the audio stopped at the pause, whatever the sink reports
+        if self._last_stop_latency is None and self._stop_at and self._caller_started_at:
+            self._last_stop_latency = max(self._stop_at - self._caller_started_at, 0.0)
+        self._caller_started_at = self._stop_at = None
+        dropped = self.output.dropped_audio if self.fast_path else 0.0
+
+        # The speech keeps the full generated message; the chat context gets a
+        # truncated copy (same id) with only what was played
+        spoken = "".join(self._spoken.pop(item.id, "") for item in speech.chat_items)
+        spoken_tokens = round(tokens * min(len(spoken) / len(generated), 1.0)) if generated else 0
+        interruption = Interruption(
+            speech_id=speech.id,
+            stop_latency=self._last_stop_latency,
+            generated_tokens=tokens,
+            wasted_tokens=tokens - spoken_tokens,
+            dropped_audio=dropped,
+        )
+        self.interruptions.append(interruption)
+        self._last_stop_latency = None
+
+        latency = interruption.stop_latency
+        logger.info(
+            f"[{'fast' if self.fast_path else 'default'}] interruption {len(self.interruptions)}: "
+            f"stop_latency={f'{latency * 1000:.0f}ms' if latency is not None else 'n/a'}, "
+            f"wasted_tokens={interruption.wasted_tokens}/{tokens}, "
+            f"dropped_audio={interruption.dropped_audio:.1f}s"
+        )
+
+    def summary(self) -> str:
+        mode = "fast" if self.fast_path else "default"
+        false_starts = f", {self.false_starts} false starts" if self.fast_path else ""
+        if not self.interruptions:
+            return f"[{mode}] no interruptions{false_starts}"
+        latencies = [i.stop_latency for i in self.interruptions if i.stop_latency is not None]
+        wasted = sum(i.wasted_tokens for i in self.interruptions) / len(self.interruptions)
+        latency_text = (
+            f"avg stop latency={sum(latencies) / len(latencies) * 1000:.0f}ms, "
+            f"worst={max(latencies) * 1000:.0f}ms, "
+            if latencies
+            else ""
+        )
+        return (
+            f"[{mode}] {len(self.interruptions)} interruptions, {latency_text}"
+            f"avg wasted tokens={wasted:.1f}{false_starts}"
+        )
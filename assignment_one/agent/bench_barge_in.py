@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Offline barge-in harness: how long does the agent keep talking over the caller?
+
+Runs a real AgentSession with scripted stand-ins for the network parts: an LLM
+that streams a long reply at a fixed token rate, a TTS that synthesizes faster
+than realtime (and takes a moment to shut down, like a websocket), an energy
+VAD, a caller audio input that starts talking over the agent, and a room audio
+output that queues audio the way LiveKit's does. Each run injects overlapping
+speech a fixed time into the agent's reply, once with the default interruption
+path and once with the BargeInMonitor fast path, then reports:
+
+- stop latency: caller speech onset -> agent audio actually stopped
+- tokens generated after the caller started talking (LLM not cancelled yet)
+- wasted tokens: generated but never played
+
+A second pass plays a 100ms backchannel ("mm-hmm") instead, which must not
+interrupt the agent, and reports how long the agent went silent because of it.
+
+Usage: python bench_barge_in.py [runs] [barge_after_ms]
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+from livekit import rtc
+from livekit.agents import APIConnectOptions, Agent, AgentSession, llm, stt, tts, vad
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS
+from livekit.agents.voice import io
+from livekit.agents.voice.transcription import TranscriptSynchronizer
+
+from barge_in import BargeInMonitor, PacedAudioOutput
+
+INPUT_RATE = 16000
+OUTPUT_RATE = 24000
+FRAME_S = 0.02
+
+LLM_TTFT = 0.35
+LLM_TOKEN_S = 0.04  # 25 tokens/s, a loaded gpt-4o
+TTS_TTFB = 0.2
+TTS_SECONDS_PER_CHAR = 0.065  # ~15 characters/s of speech
+TTS_CLOSE_DELAY = 0.15  # websocket teardown when a synthesis is cancelled
+FAST_MIN_INTERRUPTION = 0.2  # min_interruption_duration used with the fast path
+BACKCHANNEL = 0.1
+
+REPLY = (
+    "I understand this is a difficult time, and I really appreciate you taking my call today. "
+    "Your SecureBank credit card has a balance of two thousand eight hundred and forty seven "
+    "dollars that is now forty five days past due, and I would like to help you find a way "
+    "to bring the account current. Many of our customers in a similar situation have found "
+    "that a small payment this week, followed by a plan for the remaining balance, works well "
+    "for them. Would you be able to make a partial payment today, or would you prefer that we "
+    "set up a payment plan together?"
+)
+
+
+def tokens_of(text: str) -> list[str]:
+    words = text.split(" ")
+    return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+
+class ScriptedLLM(llm.LLM):
+    """Streams REPLY one word-sized token at a time"""
+
+    def __init__(self):
+        super().__init__()
+        self.token_times: list[float] = []  # monotonic time each token was generated
+
+    def chat(self, *, chat_ctx, tools=None, conn_options=DEFAULT_API_CONNECT_OPTIONS, **kwargs):
+        return ScriptedLLMStream(self, chat_ctx=chat_ctx, tools=tools or [], conn_options=conn_options)
+
+
+class ScriptedLLMStream(llm.LLMStream):
+    async def _run(self) -> None:
+        await asyncio.sleep(LLM_TTFT)
+        tokens = tokens_of(REPLY)
+        for token in tokens:
+            self._event_ch.send_nowait(
+                llm.ChatChunk(id="scripted", delta=llm.ChoiceDelta(role="assistant", content=token))
+            )
+            self._llm.token_times.append(time.monotonic())
+            await asyncio.sleep(LLM_TOKEN_S)
+        self._event_ch.send_nowait(
+            llm.ChatChunk(
+                id="scripted",
+                usage=llm.CompletionUsage(completion_tokens=len(tokens), prompt_tokens=0, total_tokens=len(tokens)),
+            )
+        )
+
+
+class ToneTTS(tts.TTS):
+    """Synthesizes a tone whose length follows the text, 10x faster than realtime"""
+
+    def __init__(self):
+        super().__init__(capabilities=tts.TTSCapabilities(streaming=False), sample_rate=OUTPUT_RATE, num_channels=1)
+
+    def synthesize(self, text: str, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS):
+        return ToneStream(tts=self, input_text=text, conn_options=conn_options)
+
+
+class ToneStream(tts.ChunkedStream):
+    async def _run(self, output_emitter: tts.AudioEmitter) -> None:
+        output_emitter.initialize(
+            request_id="tone", sample_rate=OUTPUT_RATE, num_channels=1, mime_type="audio/pcm"
+        )
+        try:
+            await asyncio.sleep(TTS_TTFB)
+            samples = int(len(self._input_text) * TTS_SECONDS_PER_CHAR * OUTPUT_RATE)
+            t = np.arange(samples) / OUTPUT_RATE
+            pcm = (0.2 * np.sin(2 * np.pi * 220 * t) * 32767).astype(np.int16).tobytes()
+            chunk = int(0.1 * OUTPUT_RATE) * 2
+            for i in range(0, len(pcm), chunk):
+                output_emitter.push(pcm[i : i + chunk])
+                await asyncio.sleep(0.01)
+            output_emitter.flush()
+        except asyncio.CancelledError:
+            await asyncio.sleep(TTS_CLOSE_DELAY)
+            raise
+
+
+class EnergyVAD(vad.VAD):
+    """Threshold VAD standing in for Silero on synthetic audio"""
+
+    def __init__(self, min_speech: float = 0.05, min_silence: float = 0.4):
+        super().__init__(capabilities=vad.VADCapabilities(update_interval=FRAME_S))
+        self.min_speech = min_speech
+        self.min_silence = min_silence
+
+    def stream(self) -> "EnergyVADStream":
+        return EnergyVADStream(self)
+
+
+class EnergyVADStream(vad.VADStream):
+    async def _main_task(self) -> None:
+        speaking = False
+        speech = silence = 0.0
+        samples = 0
+
+        def event(type_: vad.VADEventType, frame: rtc.AudioFrame) -> vad.VADEvent:
+            return vad.VADEvent(
+                type=type_,
+                samples_index=samples,
+                timestamp=time.time(),
+                speech_duration=speech,
+                silence_duration=silence,
+                frames=[frame],
+                speaking=speaking,
+            )
+
+        async for frame in self._input_ch:
+            if not isinstance(frame, rtc.AudioFrame):
+                continue
+            pcm = np.frombuffer(frame.data, dtype=np.int16).astype(np.float32) / 32768
+            samples += frame.samples_per_channel
+            if np.sqrt(np.mean(pcm**2)) > 0.02:
+                speech += frame.duration
+                silence = 0.0
+            else:
+                silence += frame.duration
+                if not speaking:
+                    speech = 0.0
+
+            if not speaking and speech >= self._vad.min_speech:
+                speaking = True
+                self._event_ch.send_nowait(event(vad.VADEventType.START_OF_SPEECH, frame))
+            elif speaking and silence >= self._vad.min_silence:
+                speaking = False
+                self._event_ch.send_nowait(event(vad.VADEventType.END_OF_SPEECH, frame))
+                speech = 0.0
+            self._event_ch.send_nowait(event(vad.VADEventType.INFERENCE_DONE, frame))
+
+
+class SilentSTT(stt.STT):
+    """Never transcribes anything, like a real STT on a cough or an "mm-hmm",
+    so caller noise alone never ends a user turn"""
+
+    def __init__(self):
+        super().__init__(capabilities=stt.STTCapabilities(streaming=True, interim_results=False))
+
+    async def _recognize_impl(self, buffer, *, language=None, conn_options=DEFAULT_API_CONNECT_OPTIONS):
+        return stt.SpeechEvent(type=stt.SpeechEventType.FINAL_TRANSCRIPT, alternatives=[])
+
+    def stream(self, *, language=None, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS):
+        return SilentSTTStream(stt=self, conn_options=conn_options)
+
+
+class SilentSTTStream(stt.RecognizeStream):
+    async def _run(self) -> None:
+        async for _ in self._input_ch:
+            pass
+
+
+class CallerAudioInput(io.AudioInput):
+    """Realtime caller audio: near-silence, with speech injected on demand"""
+
+    def __init__(self):
+        super().__init__(label="Caller")
+        self._next_at: Optional[float] = None
+        self._speech_left = 0.0
+        self._rng = np.random.default_rng(0)
+        self.speech_started_at: Optional[float] = None
+
+    def talk(self, seconds: float) -> None:
+        self._speech_left = seconds
+
+    async def __anext__(self) -> rtc.AudioFrame:
+        now = time.monotonic()
+        self._next_at = max(self._next_at or now, now - FRAME_S) + FRAME_S
+        await asyncio.sleep(max(self._next_at - now, 0))
+
+        samples = int(FRAME_S * INPUT_RATE)
+        amplitude = 0.001
+        if self._speech_left > 0:
+            if self.speech_started_at is None:
+                self.speech_started_at = time.monotonic()
+            self._speech_left -= FRAME_S
+            amplitude = 0.3
+        pcm = (self._rng.standard_normal(samples) * amplitude * 32767).clip(-32768, 32767).astype(np.int16)
+        return rtc.AudioFrame(pcm.tobytes(), INPUT_RATE, 1, samples)
+
+
+class SimulatedRoomOutput(io.AudioOutput):
+    """Queues audio like LiveKit's room output: cleared only via flush + clear_buffer"""
+
+    def __init__(self):
+        super().__init__(label="SimulatedRoom", next_in_chain=None, sample_rate=OUTPUT_RATE)
+        self._play_end = 0.0
+        self._pushed = 0.0
+        self._interrupted = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.first_audio_at: Optional[float] = None
+        self.silence = 0.0  # underruns: time nothing was playing mid-reply
+        self.segments: list[tuple[float, bool, float]] = []  # (played_s, interrupted, stopped_at)
+
+    async def capture_frame(self, frame: rtc.AudioFrame) -> None:
+        await super().capture_frame(frame)
+        now = time.monotonic()
+        self.first_audio_at = self.first_audio_at or now
+        if self._pushed:
+            self.silence += max(now - self._play_end, 0)
+        self._play_end = max(self._play_end, now) + frame.duration
+        self._pushed += frame.duration
+
+    def flush(self) -> None:
+        super().flush()
+        if self._pushed:
+            self._flush_task = asyncio.create_task(self._wait_for_playout())
+
+    def clear_buffer(self) -> None:
+        if self._pushed:
+            self._interrupted.set()
+
+    async def _wait_for_playout(self) -> None:
+        queued = max(self._play_end - time.monotonic(), 0)
+        try:
+            await asyncio.wait_for(self._interrupted.wait(), queued)
+        except asyncio.TimeoutError:
+            pass
+        interrupted = self._interrupted.is_set()  # clear_buffer right after flush counts too
+
+        now = time.monotonic()
+        played = self._pushed - max(self._play_end - now, 0)
+        stopped_at = min(now, self._play_end)
+        self._play_end = min(self._play_end, now)
+        self._pushed = 0.0
+        self._interrupted.clear()
+        self.segments.append((played, interrupted, stopped_at))
+        self.on_playback_finished(playback_position=played, interrupted=interrupted)
+
+
+class NullTextOutput(io.TextOutput):
+    def __init__(self):
+        super().__init__(label="Null", next_in_chain=None)
+
+    async def capture_text(self, text: str) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+
+class HarnessAgent(Agent):
+    def __init__(self, monitor: BargeInMonitor):
+        super().__init__(instructions="You are Anjali, a debt collection agent.")
+        self.monitor = monitor
+
+    async def llm_node(self, chat_ctx, tools, model_settings):
+        async for chunk in self.monitor.track_generation(
+            Agent.default.llm_node(self, chat_ctx, tools, model_settings)
+        ):
+            yield chunk
+
+
+async def start_session(fast_path: bool):
+    fake_llm = ScriptedLLM()
+    min_interruption = FAST_MIN_INTERRUPTION if fast_path else 0.5
+    session = AgentSession(
+        vad=EnergyVAD(),
+        stt=SilentSTT(),
+        llm=fake_llm,
+        tts=ToneTTS(),
+        min_interruption_duration=min_interruption,
+    )
+    caller = CallerAudioInput()
+    room = SimulatedRoomOutput()
+
+    # Same chain as RoomIO: transcript synchronizer in front of the room output
+    synchronizer = TranscriptSynchronizer(next_in_chain_audio=room, next_in_chain_text=NullTextOutput())
+    head = PacedAudioOutput(synchronizer.audio_output) if fast_path else synchronizer.audio_output
+    session.input.audio = caller
+    session.output.audio = head
+    session.output.transcription = synchronizer.text_output
+
+    monitor = BargeInMonitor(session, head, fast_path=fast_path)
+    monitor.attach()
+    await session.start(HarnessAgent(monitor))
+
+    handle = session.generate_reply(instructions="Explain the overdue balance.")
+    while room.first_audio_at is None:
+        await asyncio.sleep(0.005)
+
+    async def close() -> None:
+        await session.aclose()
+        await synchronizer.aclose()
+        if isinstance(head, PacedAudioOutput):
+            await head.aclose()
+
+    return session, fake_llm, caller, room, monitor, handle, close
+
+
+async def run_once(fast_path: bool, barge_after: float) -> dict:
+    session, fake_llm, caller, room, monitor, handle, close = await start_session(fast_path)
+    await asyncio.sleep(barge_after)
+    caller.talk(1.0)
+
+    await asyncio.wait_for(handle.wait_for_playout(), 15)
+    await asyncio.sleep(0.2)
+    await close()
+
+    played = sum(s[0] for s in room.segments)
+    onset = caller.speech_started_at
+    stopped_at = next((s[2] for s in room.segments if s[1]), room.segments[-1][2])
+
+    # Map played audio back to text to count tokens actually heard
+    heard_chars = played / TTS_SECONDS_PER_CHAR
+    text = ""
+    heard_tokens = 0
+    for token in tokens_of(REPLY)[: len(fake_llm.token_times)]:
+        text += token
+        if len(text) > heard_chars:
+            break
+        heard_tokens += 1
+
+    estimate = monitor.interruptions[-1] if monitor.interruptions else None
+    return {
+        "stop_latency": stopped_at - onset,
+        "generated": len(fake_llm.token_times),
+        "generated_after": sum(1 for t in fake_llm.token_times if t > onset),
+        "wasted": len(fake_llm.token_times) - heard_tokens,
+        "monitor_latency": estimate.stop_latency if estimate else None,
+        "monitor_wasted": estimate.wasted_tokens if estimate else None,
+    }
+
+
+async def run_backchannel(fast_path: bool, barge_after: float) -> dict:
+    session, _, caller, room, monitor, handle, close = await start_session(fast_path)
+    await asyncio.sleep(barge_after)
+    silence_before = room.silence
+    caller.talk(BACKCHANNEL)
+
+    await asyncio.sleep(2.0)
+    result = {"interrupted": handle.interrupted, "silence": room.silence - silence_before}
+    session.interrupt()
+    await asyncio.sleep(0.3)
+    await close()
+    return result
+
+
+def report(label: str, results: list[dict]) -> None:
+    def avg(key: str) -> float:
+        values = [r[key] for r in results if r[key] is not None]
+        return statistics.mean(values) if values else float("nan")
+
+    latencies = sorted(r["stop_latency"] for r in results)
+    print(
+        f"{label:<10}{avg('stop_latency') * 1000:>8.0f}ms{latencies[-1] * 1000:>8.0f}ms"
+        f"{avg('generated'):>10.1f}{avg('generated_after'):>10.1f}{avg('wasted'):>9.1f}"
+        f"{avg('monitor_latency') * 1000:>10.0f}ms{avg('monitor_wasted'):>9.1f}"
+    )
+
+
+async def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    barge_after = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 1.0
+
+    print(f"🗣️  Caller talks over the agent {barge_after * 1000:.0f}ms into the reply ({runs} runs per mode)")
+    print("=" * 82)
+    print(f"{'mode':<10}{'stop avg':>10}{'worst':>10}{'generated':>10}{'after':>10}{'wasted':>9}"
+          f"{'monitor':>12}{'m.wasted':>9}")
+
+    for label, fast_path in (("default", False), ("fast", True)):
+        results = [await run_once(fast_path, barge_after) for _ in range(runs)]
+        report(label, results)
+
+    print(f"\n🤏 {BACKCHANNEL * 1000:.0f}ms backchannel instead (must not interrupt)")
+    print("=" * 82)
+    print(f"{'mode':<10}{'interrupted':>12}{'agent silent':>14}")
+    for label, fast_path in (("default", False), ("fast", True)):
+        results = [await run_backchannel(fast_path, barge_after) for _ in range(runs)]
+        interrupted = sum(r["interrupted"] for r in results)
+        silence = statistics.mean(r["silence"] for r in results)
+        print(f"{label:<10}{interrupted:>9}/{runs:<2}{silence * 1000:>12.0f}ms")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main())
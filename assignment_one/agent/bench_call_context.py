@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark call context decode cost per dispatch
+
+Decodes dispatch metadata of increasing size (phone number only, the usual
+account fields, and a large account with two years of payment history) in
+JSON and, if installed, msgpack, and compares it with the bare json.loads the
+worker used to do. Also times the cached for_job() lookup that every later
+read in the same job hits.
+Usage: python bench_call_context.py [iterations]
+"""
+
+import json
+import sys
+import time
+from dataclasses import replace
+from types import SimpleNamespace
+
+import call_context
+from call_context import CallContext, decode, for_job
+
+
+def contexts() -> dict[str, CallContext]:
+    history = [
+        {"month": f"2024-{m % 12 + 1:02d}", "paid": round(120.5 * (m % 3), 2), "status": "late" if m % 4 else "ok"}
+        for m in range(24)
+    ]
+    typical = CallContext(
+        phone_number="+919650098052",
+        persona="anjali",
+        customer_full_name="Ritav Das",
+        account_last_four="4729",
+        amount_due=2847.32,
+        days_overdue=45,
+    )
+    return {
+        "phone only": CallContext(phone_number="+919650098052"),
+        "account fields": typical,
+        "large account": replace(
+            typical,
+            account={
+                "payment_history": history,
+                "notes": ["Promised payment on previous call, did not follow through."] * 10,
+                "preferred_language": "en-IN",
+            },
+        ),
+    }
+
+
+def per_call_us(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    formats = ["json"] + (["msgpack"] if call_context.msgpack else [])
+
+    print(f"📦 Call context decode cost ({iterations} dispatches each)")
+    print("=" * 66)
+    print(f"{'context':<16}{'format':<9}{'bytes':>7}{'json.loads':>12}{'decode':>10}{'cached':>10}")
+
+    for label, context in contexts().items():
+        for fmt in formats:
+            raw = context.encode(fmt)
+            assert decode(raw) == context
+            job = SimpleNamespace(id=f"{label}-{fmt}", metadata=raw)
+            for_job(job)
+
+            baseline = per_call_us(lambda: json.loads(raw), iterations) if fmt == "json" else None
+            decoded = per_call_us(lambda: decode(raw), iterations)
+            cached = per_call_us(lambda: for_job(job), iterations)
+            baseline_text = f"{baseline:.1f}us" if baseline is not None else "-"
+            print(f"{label:<16}{fmt:<9}{len(raw):>7}{baseline_text:>12}{decoded:>8.1f}us{cached:>8.2f}us")
+
+    if not call_context.msgpack:
+        print("\n(msgpack not installed, JSON only)")
+
+
+if __name__ == "__main__":
+    main()
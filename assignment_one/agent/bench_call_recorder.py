@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark in-worker call recording cost
+
+Feeds synthetic 20ms PCM frames for both sides of a call through TrackEncoder
+as fast as it will take them, then reports encoder CPU per call-minute, the
+realtime factor and the resulting file size. At 1s of CPU per call-minute a
+single core can record about 60 concurrent calls.
+Usage: python bench_call_recorder.py [call_seconds]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from call_recorder import SAMPLE_RATE, TrackEncoder
+
+FRAME_SAMPLES = SAMPLE_RATE // 50  # 20ms, what rtc.AudioStream delivers
+
+
+def synthetic_frames(seconds: float, seed: int) -> list[bytes]:
+    """Speech-like audio: a wobbling tone in noise, with pauses"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    tone = np.sin(2 * np.pi * (180 + 40 * np.sin(2 * np.pi * 3 * t)) * t)
+    talking = (np.sin(2 * np.pi * 0.2 * t + seed) > -0.3).astype(float)
+    signal = (0.3 * tone * talking + 0.02 * rng.standard_normal(t.size)) * 32767
+    pcm = signal.astype(np.int16)
+    usable = pcm.size - pcm.size % FRAME_SAMPLES
+    return [pcm[i : i + FRAME_SAMPLES].tobytes() for i in range(0, usable, FRAME_SAMPLES)]
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 120.0
+    tracks = {"caller": synthetic_frames(seconds, 1), "agent": synthetic_frames(seconds, 2)}
+
+    print(f"🎙️  Encoding a {seconds:.0f}s two-track call to Opus")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Ring sized to the whole call so nothing is dropped when pushing faster than realtime
+        encoders = {
+            label: TrackEncoder(os.path.join(tmp, f"{label}.ogg"), ring_frames=len(frames) + 1)
+            for label, frames in tracks.items()
+        }
+
+        start = time.perf_counter()
+        push_start = time.thread_time()
+        for frames in zip(*tracks.values()):
+            for encoder, pcm in zip(encoders.values(), frames):
+                encoder.push(pcm)
+        push_cpu = time.thread_time() - push_start
+        for encoder in encoders.values():
+            encoder.close(timeout=None)
+        elapsed = time.perf_counter() - start
+
+        encode_cpu = sum(e.cpu_seconds for e in encoders.values())
+        size = sum(os.path.getsize(e.path) for e in encoders.values())
+        dropped = sum(e.frames_dropped for e in encoders.values())
+
+    minutes = seconds / 60
+    print(f"Encoder CPU:        {encode_cpu / minutes:.3f}s per call-minute")
+    print(f"Event loop CPU:     {push_cpu / minutes * 1000:.1f}ms per call-minute (push)")
+    print(f"Realtime factor:    {seconds / elapsed:.0f}x")
+    print(f"File size:          {size / minutes / 1024:.0f}KB per call-minute")
+    print(f"Frames dropped:     {dropped}")
+    print(f"Calls per core:     ~{60 / max(encode_cpu / minutes, 1e-9):.0f}")
+
+
+if __name__ == "__main__":
+    main()
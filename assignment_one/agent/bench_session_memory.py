@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory per concurrent call and call density per host
+
+Forks one process per simulated call, the way the LiveKit worker runs jobs, and
+compares loading Silero in every job (the old prewarm) against loading it once
+in the parent before forking (shared_models). Each call runs VAD inference and
+fills a SessionMemory with a typical transcript and chat context.
+Usage: python bench_session_memory.py [calls] [budget_mb]
+"""
+
+import multiprocessing as mp
+import sys
+
+import numpy as np
+import psutil
+from livekit.plugins import silero
+from livekit.plugins.silero import onnx_model
+
+from session_memory import SessionMemory
+
+TURNS = 40
+TURN_TEXT = "I understand, Ritav. Your payment of $2,847.32 is 45 days past due. " * 3
+
+
+def simulate_call(shared_vad, ready, done) -> None:
+    vad = shared_vad or silero.VAD.load()
+    model = onnx_model.OnnxModel(onnx_session=vad._onnx_session, sample_rate=16000)
+    window = np.zeros(model.window_size_samples, dtype=np.float32)
+    for _ in range(200):
+        model(window)
+
+    memory = SessionMemory("bench")
+    chat_history = []
+    for i in range(TURNS):
+        role = "assistant" if i % 2 else "user"
+        memory.add_transcript(role, TURN_TEXT)
+        chat_history.append(TURN_TEXT)
+    audio = bytearray(16000 * 2 * 10)  # 10s of buffered PCM
+    memory.reserve_audio(len(audio))
+
+    ready.set()
+    done.wait()
+
+
+def measure(calls: int, shared: bool) -> list:
+    ctx = mp.get_context("fork")
+    shared_vad = silero.VAD.load() if shared else None
+    done = ctx.Event()
+    procs, events = [], []
+
+    for _ in range(calls):
+        ready = ctx.Event()
+        p = ctx.Process(target=simulate_call, args=(shared_vad, ready, done))
+        p.start()
+        procs.append(p)
+        events.append(ready)
+
+    for ready in events:
+        ready.wait()
+    infos = [psutil.Process(p.pid).memory_full_info() for p in procs]
+
+    done.set()
+    for p in procs:
+        p.join()
+    return infos
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    budget_mb = float(sys.argv[2]) if len(sys.argv) > 2 else 4096
+
+    print(f"🧠 Memory per concurrent call ({calls} calls, {budget_mb:.0f}MB budget)")
+    print("=" * 60)
+    print(f"{'mode':<14}{'rss/call':>12}{'pss/call':>12}{'uss/call':>12}{'calls fit':>10}")
+
+    for name, shared in (("per-process", False), ("shared (cow)", True)):
+        infos = measure(calls, shared)
+        rss = np.mean([i.rss for i in infos]) / 1e6
+        pss = np.mean([getattr(i, "pss", i.uss) for i in infos]) / 1e6
+        uss = np.mean([i.uss for i in infos]) / 1e6
+        # PSS splits shared pages across the processes using them, so it is
+        # the marginal cost of one more call on a host full of them
+        print(f"{name:<14}{rss:>11.1f}M{pss:>11.1f}M{uss:>11.1f}M{int(budget_mb // pss):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk token minting: AccessToken builder vs TokenService
+
+Mints one token per room for N rooms with the api.AccessToken builder (what
+generate_token.py used to do), with a cold TokenService (every token signed)
+and a warm one (every token served from cache), then verifies a sample of the
+TokenService tokens with api.TokenVerifier.
+Usage: python bench_token_service.py [rooms]
+"""
+
+import sys
+import time
+
+from livekit import api
+
+from token_service import TokenRequest, TokenService, room_grants
+
+API_KEY = "bench-key"
+API_SECRET = "bench-secret-that-is-long-enough-for-hs256"
+
+
+def builder_mint(rooms: list[str]) -> list[str]:
+    return [
+        api.AccessToken(API_KEY, API_SECRET)
+        .with_identity("supervisor")
+        .with_name("supervisor")
+        .with_grants(room_grants(room))
+        .to_jwt()
+        for room in rooms
+    ]
+
+
+def report(label: str, count: int, elapsed: float) -> None:
+    print(f"{label:<22}{count / elapsed:>12,.0f} tokens/s{elapsed * 1e6 / count:>10.1f}us each")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rooms = [f"debt-collection-{i}" for i in range(count)]
+    requests = [TokenRequest("supervisor", room, name="supervisor") for room in rooms]
+
+    print(f"🔑 Minting tokens for {count} rooms")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    builder_mint(rooms)
+    report("AccessToken builder", count, time.perf_counter() - start)
+
+    service = TokenService(API_KEY, API_SECRET)
+    start = time.perf_counter()
+    tokens = service.mint_many(requests)
+    report("TokenService (cold)", count, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    service.mint_many(requests)
+    report("TokenService (cached)", count, time.perf_counter() - start)
+    print(f"   cache: {service.hits} hits, {service.misses} misses")
+
+    verifier = api.TokenVerifier(API_KEY, API_SECRET)
+    for room, token in list(zip(rooms, tokens))[:: max(count // 100, 1)]:
+        claims = verifier.verify(token)
+        assert claims.identity == "supervisor" and claims.video.room == room
+    print("✅ TokenService tokens verify with api.TokenVerifier")
+
+
+if __name__ == "__main__":
+    main()
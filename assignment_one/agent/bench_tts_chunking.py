@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark time-to-first-audio for clause chunking vs the default segmentation
+
+Replays typical Anjali replies as a simulated LLM token stream (fixed time to
+first token, fixed inter-token delay) through each tokenizer and adds a fixed
+TTS time-to-first-byte to the moment the first chunk is released.
+Usage: python bench_tts_chunking.py [llm_ttft_ms] [token_ms] [tts_ttfb_ms]
+"""
+
+import asyncio
+import sys
+import time
+
+from livekit.agents import tokenize
+
+from tts_chunking import ClauseTokenizer
+
+REPLIES = [
+    "Hi Ritav, this is Anjali calling from SecureBank regarding your credit card "
+    "account. Do you have a few minutes to speak with me about your account?",
+    "I understand, and I appreciate you being honest with me. Your payment of "
+    "$2,847.32 is now 45 days past due. Would you be able to make a partial "
+    "payment today?",
+    "Thank you, Ritav. I'll note that you'll pay $500 by Friday. You will receive "
+    "a confirmation by SMS shortly.",
+    "No problem at all. When would be a better time for me to call you back?",
+]
+
+
+def fake_llm_tokens(text: str) -> list[str]:
+    """Split into word-sized pieces the way a streaming LLM emits them"""
+    words = text.split(" ")
+    return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+
+async def time_to_first_chunk(
+    tokenizer: tokenize.SentenceTokenizer, text: str, llm_ttft: float, token_delay: float
+) -> tuple[float, int]:
+    """Seconds until the tokenizer releases its first chunk, plus total chunks"""
+    stream = tokenizer.stream()
+    start = time.perf_counter()
+    first_chunk_at = None
+    chunks = 0
+
+    async def feed():
+        await asyncio.sleep(llm_ttft)
+        for tok in fake_llm_tokens(text):
+            stream.push_text(tok)
+            await asyncio.sleep(token_delay)
+        stream.end_input()
+
+    feeder = asyncio.create_task(feed())
+    async for _ in stream:
+        chunks += 1
+        if first_chunk_at is None:
+            first_chunk_at = time.perf_counter() - start
+    await feeder
+
+    return first_chunk_at or 0.0, chunks
+
+
+async def main():
+    llm_ttft = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.35
+    token_delay = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.03
+    tts_ttfb = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.12
+
+    tokenizers = {
+        "default": tokenize.blingfire.SentenceTokenizer(),
+        "clause": ClauseTokenizer(),
+    }
+
+    print("⏱️  Time-to-first-audio per turn (ms)")
+    print(
+        f"   llm_ttft={llm_ttft * 1000:.0f}ms token={token_delay * 1000:.0f}ms "
+        f"tts_ttfb={tts_ttfb * 1000:.0f}ms"
+    )
+    print("=" * 50)
+    print(f"{'turn':<6}{'default':>12}{'clause':>12}{'saved':>12}")
+
+    totals = {name: 0.0 for name in tokenizers}
+    for i, reply in enumerate(REPLIES, 1):
+        results = {}
+        for name, tok in tokenizers.items():
+            first_chunk, _ = await time_to_first_chunk(tok, reply, llm_ttft, token_delay)
+            results[name] = first_chunk + tts_ttfb
+            totals[name] += results[name]
+
+        print(
+            f"{i:<6}{results['default'] * 1000:>12.0f}{results['clause'] * 1000:>12.0f}"
+            f"{(results['default'] - results['clause']) * 1000:>12.0f}"
+        )
+
+    print("=" * 50)
+    avg = {name: total / len(REPLIES) for name, total in totals.items()}
+    print(
+        f"{'avg':<6}{avg['default'] * 1000:>12.0f}{avg['clause'] * 1000:>12.0f}"
+        f"{(avg['default'] - avg['clause']) * 1000:>12.0f}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
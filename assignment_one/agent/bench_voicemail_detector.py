@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark voicemail detection accuracy and latency
+
+Usage:
+    python bench_voicemail_detector.py <samples_dir>   # samples_dir/{human,machine}/*.wav
+    python bench_voicemail_detector.py                 # synthetic pickups
+
+Recorded samples should be mono 16-bit WAV files of the callee audio starting
+at pickup; they are resampled to the detector rate if needed.
+"""
+
+import os
+import sys
+import time
+import wave
+
+import numpy as np
+
+from voicemail_detector import HUMAN, MACHINE, DetectorConfig, VoicemailDetector
+
+RATE = DetectorConfig().sample_rate
+
+
+def load_wav(path: str) -> np.ndarray:
+    with wave.open(path, "rb") as wav:
+        rate = wav.getframerate()
+        channels = wav.getnchannels()
+        pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+
+    if channels > 1:
+        pcm = pcm.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    if rate != RATE:
+        t_old = np.arange(len(pcm)) / rate
+        t_new = np.arange(int(len(pcm) * RATE / rate)) / RATE
+        pcm = np.interp(t_new, t_old, pcm).astype(np.int16)
+    return pcm
+
+
+def load_samples(samples_dir: str) -> list[tuple[str, str, np.ndarray]]:
+    samples = []
+    for label in (HUMAN, MACHINE):
+        label_dir = os.path.join(samples_dir, label)
+        if not os.path.isdir(label_dir):
+            continue
+        for name in sorted(os.listdir(label_dir)):
+            if name.endswith(".wav"):
+                path = os.path.join(label_dir, name)
+                samples.append((f"{label}/{name}", label, load_wav(path)))
+    return samples
+
+
+def _silence(rng, seconds: float) -> np.ndarray:
+    return rng.normal(0, 30, int(seconds * RATE))  # line noise, around -60dBFS
+
+
+def _speech(rng, seconds: float) -> np.ndarray:
+    """Voiced harmonics with syllable-rate amplitude modulation"""
+    t = np.arange(int(seconds * RATE)) / RATE
+    f0 = rng.uniform(100, 240)
+    voice = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 12))
+    envelope = 0.55 + 0.45 * np.sin(2 * np.pi * rng.uniform(3, 5) * t)
+    return 3000 * voice * envelope + rng.normal(0, 300, len(t))
+
+
+def _background(rng, pcm: np.ndarray, dbfs: float) -> np.ndarray:
+    """Add steady background noise (car, street) at the given level"""
+    return pcm + rng.normal(0, 32768 * 10 ** (dbfs / 20), len(pcm))
+
+
+def _beep(rng, seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return 8000 * np.sin(2 * np.pi * rng.choice([440, 850, 1000, 1400]) * t)
+
+
+def synthetic_samples(count: int = 40, seed: int = 7) -> list[tuple[str, str, np.ndarray]]:
+    rng = np.random.default_rng(seed)
+    noise_rng = np.random.default_rng(seed + 1)  # keeps the clean samples unchanged
+    samples = []
+
+    for i in range(count):
+        parts = [_silence(rng, rng.uniform(0.2, 1.0)), _speech(rng, rng.uniform(0.4, 1.2))]
+        if i % 3 == 0:  # "Hello? ... Hello?"
+            parts += [_silence(rng, 0.3), _speech(rng, rng.uniform(0.3, 0.6))]
+        elif i % 3 == 1:  # "Hello? ... Hello? ... who is this?" with real pauses
+            for _ in range(2):
+                parts += [_silence(rng, rng.uniform(0.4, 0.8)), _speech(rng, rng.uniform(0.4, 0.9))]
+        parts.append(_silence(rng, 3.0))
+        pcm = np.concatenate(parts)
+        if i % 2 == 0:  # answering in a car or on the street
+            pcm = _background(noise_rng, pcm, noise_rng.uniform(-38, -32))
+        samples.append((f"human/synthetic-{i}", HUMAN, pcm))
+
+    for i in range(count):
+        parts = [_silence(rng, rng.uniform(0.1, 0.6))]
+        if i % 4 == 0:  # short "leave a message" followed by the beep
+            parts += [_speech(rng, rng.uniform(1.0, 1.6)), _silence(rng, 0.4)]
+            parts.append(_beep(rng, 0.5))
+        elif i % 4 == 1:  # sentence by sentence, pausing between them, no beep
+            for _ in range(rng.integers(4, 7)):
+                parts += [_speech(rng, rng.uniform(0.8, 1.6)), _silence(rng, rng.uniform(0.4, 0.6))]
+        else:
+            for _ in range(rng.integers(3, 7)):
+                parts += [_speech(rng, rng.uniform(0.6, 1.4)), _silence(rng, rng.uniform(0.1, 0.3))]
+        parts.append(_silence(rng, 2.0))
+        pcm = np.concatenate(parts)
+        if i % 5 == 0:  # noisy line
+            pcm = _background(noise_rng, pcm, noise_rng.uniform(-45, -38))
+        samples.append((f"machine/synthetic-{i}", MACHINE, pcm))
+
+    return [(name, label, np.clip(pcm, -32768, 32767).astype(np.int16)) for name, label, pcm in samples]
+
+
+def run(samples: list[tuple[str, str, np.ndarray]]) -> None:
+    chunk = RATE // 100  # push 10ms at a time, like a live audio stream
+    confusion: dict[tuple[str, str], int] = {}
+    latencies = []
+    audio_total = 0.0
+    cpu_total = 0.0
+
+    for name, label, pcm in samples:
+        detector = VoicemailDetector()
+        start = time.perf_counter()
+        result = None
+        for i in range(0, len(pcm), chunk):
+            result = detector.push(pcm[i : i + chunk])
+            if result:
+                break
+        result = result or detector.finish()
+        cpu_total += time.perf_counter() - start
+        audio_total += result.audio_seconds
+
+        confusion[(label, result.verdict)] = confusion.get((label, result.verdict), 0) + 1
+        latencies.append(result.audio_seconds)
+        if result.verdict != label:
+            print(f"   ✗ {name}: expected {label}, got {result.verdict} ({result.reason})")
+
+    correct = sum(n for (label, verdict), n in confusion.items() if label == verdict)
+    lat = np.array(latencies)
+
+    print("=" * 50)
+    print(f"📊 Accuracy: {correct}/{len(samples)} ({100 * correct / len(samples):.1f}%)")
+    for label in (HUMAN, MACHINE):
+        row = {v: n for (l, v), n in confusion.items() if l == label}
+        print(f"   {label:<8} → {row}")
+    print(
+        f"⏱️  Decision latency (audio seconds): mean={lat.mean():.2f} "
+        f"p50={np.percentile(lat, 50):.2f} p95={np.percentile(lat, 95):.2f}"
+    )
+    print(
+        f"⚙️  CPU: {cpu_total * 1000:.1f}ms for {audio_total:.1f}s of audio "
+        f"({audio_total / max(cpu_total, 1e-9):.0f}x realtime)"
+    )
+
+
+def main():
+    if len(sys.argv) > 1:
+        samples = load_samples(sys.argv[1])
+        if not samples:
+            print(f"❌ No WAV files under {sys.argv[1]}/human or {sys.argv[1]}/machine")
+            sys.exit(1)
+        print(f"🎧 {len(samples)} recorded samples from {sys.argv[1]}")
+    else:
+        samples = synthetic_samples()
+        print(f"🎧 {len(samples)} synthetic samples (pass a directory for recordings)")
+
+    run(samples)
+
+
+if __name__ == "__main__":
+    main()
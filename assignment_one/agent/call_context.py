@@ -0,0 +1,151 @@
+"""
+Versioned call context shared by dialers and the agent worker.
+
+make_outbound_call.py and OutboundCaller encode a CallContext into the dispatch
+(or SIP participant) metadata; the worker decodes it once per job with
+for_job() and reads typed fields from then on. The wire format is compact JSON
+by default, or base64 msgpack (prefixed "mp:") when msgpack is installed and
+asked for. Every payload carries a schema version "v"; payloads without one are
+the original {"phone_number", "persona"} dispatch metadata.
+"""
+
+import base64
+import functools
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+try:
+    import msgpack
+except ImportError:  # optional, JSON is always available
+    msgpack = None
+
+SCHEMA_VERSION = 1
+MSGPACK_PREFIX = "mp:"
+
+PHONE_NUMBER = re.compile(r"^\+\d{7,15}$")
+PHONE_SEPARATORS = re.compile(r"[\s\-.()]")
+LAST_FOUR = re.compile(r"^\d{4}$")
+
+# Wire field -> accepted types; anything else in a payload is rejected
+_FIELD_TYPES = {
+    "phone_number": (str,),
+    "persona": (str,),
+    "customer_name": (str,),
+    "customer_full_name": (str,),
+    "account_last_four": (str,),
+    "amount_due": (int, float),
+    "days_overdue": (int,),
+    "account": (dict,),
+}
+
+
+class CallContextError(ValueError):
+    """Metadata that does not match the call context schema"""
+
+
+@dataclass(frozen=True, slots=True)
+class CallContext:
+    phone_number: Optional[str] = None
+    persona: Optional[str] = None
+    customer_name: Optional[str] = None
+    customer_full_name: Optional[str] = None
+    account_last_four: Optional[str] = None
+    amount_due: Optional[float] = None
+    days_overdue: Optional[int] = None
+    account: dict = field(default_factory=dict)  # free-form extra account data
+    version: int = SCHEMA_VERSION
+
+    def __post_init__(self) -> None:
+        for name, types in _FIELD_TYPES.items():
+            value = getattr(self, name)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, types)):
+                raise CallContextError(f"{name} must be {' or '.join(t.__name__ for t in types)}")
+        if self.phone_number is not None:
+            # Dialers accept "+1-234-567-8901" and "+91 96500 98052"; store E.164
+            object.__setattr__(self, "phone_number", PHONE_SEPARATORS.sub("", self.phone_number))
+        if self.phone_number is not None and not PHONE_NUMBER.match(self.phone_number):
+            raise CallContextError(f"phone_number must be E.164, got {self.phone_number!r}")
+        if self.account_last_four is not None and not LAST_FOUR.match(self.account_last_four):
+            raise CallContextError("account_last_four must be 4 digits")
+        if self.amount_due is not None and self.amount_due < 0:
+            raise CallContextError("amount_due must not be negative")
+        if self.days_overdue is not None and self.days_overdue < 0:
+            raise CallContextError("days_overdue must not be negative")
+
+    @property
+    def is_outbound(self) -> bool:
+        return self.phone_number is not None
+
+    def template_values(self) -> dict[str, str]:
+        """Values for persona prompt/greeting placeholders; unset ones keep persona defaults"""
+        values = {}
+        if self.customer_full_name:
+            values["customer_full_name"] = self.customer_full_name
+            values["customer_name"] = self.customer_full_name.split()[0]
+        if self.customer_name:
+            values["customer_name"] = self.customer_name
+        if self.amount_due is not None:
+            values["amount_due"] = f"{self.amount_due:,.2f}"
+        if self.days_overdue is not None:
+            values["days_overdue"] = str(self.days_overdue)
+        if self.account_last_four:
+            values["account_last_four"] = self.account_last_four
+        return values
+
+    def to_dict(self) -> dict:
+        data = {"v": self.version}
+        for name in _FIELD_TYPES:
+            value = getattr(self, name)
+            if value is not None and value != {}:
+                data[name] = value
+        return data
+
+    def encode(self, fmt: str = "json") -> str:
+        """Serialize for dispatch or participant metadata"""
+        if fmt == "msgpack":
+            if msgpack is None:
+                raise RuntimeError("msgpack is not installed, use fmt='json'")
+            return MSGPACK_PREFIX + base64.b64encode(msgpack.packb(self.to_dict())).decode()
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+
+def decode(raw: Optional[str]) -> CallContext:
+    """Parse and validate metadata; empty metadata is an inbound call"""
+    if not raw:
+        return CallContext()
+
+    is_msgpack = raw.startswith(MSGPACK_PREFIX)
+    if is_msgpack and msgpack is None:
+        raise CallContextError("msgpack metadata received but msgpack is not installed")
+
+    try:
+        if is_msgpack:
+            data = msgpack.unpackb(base64.b64decode(raw[len(MSGPACK_PREFIX) :]))
+        else:
+            data = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise CallContextError(f"metadata is not valid JSON or msgpack: {e}") from e
+
+    if not isinstance(data, dict):
+        raise CallContextError("metadata must be an object")
+
+    version = data.pop("v", 0)
+    if not isinstance(version, int) or version > SCHEMA_VERSION:
+        raise CallContextError(f"unsupported schema version {version!r} (max {SCHEMA_VERSION})")
+    unknown = data.keys() - _FIELD_TYPES.keys()
+    if unknown:
+        raise CallContextError(f"unknown fields: {', '.join(sorted(unknown))}")
+
+    return CallContext(**data, version=version)
+
+
+@functools.lru_cache(maxsize=128)
+def _decode_for_job(job_id: str, raw: str) -> CallContext:
+    return decode(raw)
+
+
+def for_job(job) -> CallContext:
+    """Decode a job's metadata once; later calls for the same job are cache hits"""
+    return _decode_for_job(job.id, job.metadata or "")
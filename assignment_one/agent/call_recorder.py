@@ -0,0 +1,220 @@
+"""
+Lightweight in-worker call recording.
+
+Room-composite egress spins up a server-side compositor for what is an
+audio-only, two-party call. CallRecorder instead taps the caller's and the
+agent's audio tracks inside the worker and encodes each one to Opus/OGG
+incrementally on a background thread, so recording cost scales with worker
+cores rather than egress capacity.
+
+Frames go through a bounded ring buffer between the event loop and the encoder
+thread; if encoding ever falls behind or the session's audio memory cap is
+reached, the oldest frames are dropped (and counted) instead of letting memory
+grow. Each call writes one OGG file per
+track plus a line in recordings/index.jsonl.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+import av
+import numpy as np
+from livekit import rtc
+
+from session_memory import SessionMemory
+
+logger = logging.getLogger("call-recorder")
+
+SAMPLE_RATE = 48000  # Opus native rate, AudioStream resamples to it
+RECORDINGS_DIR = os.getenv("RECORDINGS_DIR", "../recordings")
+
+
+class TrackEncoder:
+    """Encodes 16-bit mono PCM frames to an OGG/Opus file on its own thread"""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        bitrate: int = 24000,
+        ring_frames: int = 500,  # 10s of 20ms frames
+        memory: Optional[SessionMemory] = None,
+    ):
+        self.path = path
+        self.bitrate = bitrate
+        self.memory = memory
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.cpu_seconds = 0.0
+        self._ring: queue.Queue[Optional[bytes]] = queue.Queue(maxsize=ring_frames)
+        self._thread = threading.Thread(target=self._run, name=f"encoder-{os.path.basename(path)}", daemon=True)
+        self._thread.start()
+
+    def push(self, pcm: bytes) -> None:
+        """Non-blocking; drops the oldest buffered frames when the ring or memory cap is full"""
+        if self.memory:
+            while not self.memory.reserve_audio(len(pcm)):
+                if not self._drop_oldest():
+                    # Nothing buffered to make room: the cap is held by frames being encoded
+                    self.frames_dropped += 1
+                    return
+        while True:
+            try:
+                self._ring.put_nowait(pcm)
+                return
+            except queue.Full:
+                self._drop_oldest()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush buffered frames and finalize the file"""
+        if not self._thread.is_alive():
+            return  # the encoder failed (already logged), nobody would take the marker
+        try:
+            self._ring.put(None, timeout=timeout)
+        except queue.Full:
+            logger.error(f"Encoder for {self.path} stopped draining, file left unfinished")
+            return
+        self._thread.join(timeout)
+
+    def _drop_oldest(self) -> bool:
+        try:
+            dropped = self._ring.get_nowait()
+        except queue.Empty:
+            return False
+        self.frames_dropped += 1
+        if self.memory and dropped:
+            self.memory.release_audio(len(dropped))
+        return True
+
+    def _run(self) -> None:
+        container = None
+        pts = 0
+
+        try:
+            container = av.open(self.path, mode="w", format="ogg")
+            stream = container.add_stream("libopus", rate=SAMPLE_RATE, layout="mono")
+            stream.bit_rate = self.bitrate
+            while True:
+                pcm = self._ring.get()
+                if pcm is None:
+                    break
+                cpu_start = time.thread_time()
+                samples = np.frombuffer(pcm, dtype=np.int16).reshape(1, -1)
+                frame = av.AudioFrame.from_ndarray(samples, format="s16", layout="mono")
+                frame.sample_rate = SAMPLE_RATE
+                frame.pts = pts
+                pts += samples.shape[1]
+                for packet in stream.encode(frame):
+                    container.mux(packet)
+                self.frames_written += 1
+                self.cpu_seconds += time.thread_time() - cpu_start
+                if self.memory:
+                    self.memory.release_audio(len(pcm))
+
+            cpu_start = time.thread_time()
+            for packet in stream.encode(None):
+                container.mux(packet)
+            self.cpu_seconds += time.thread_time() - cpu_start
+        except Exception as e:
+            logger.error(f"Encoder for {self.path} failed: {e}")
+        finally:
+            if container:
+                container.close()
+
+
+class CallRecorder:
+    """Records every audio track of a call to per-track OGG files"""
+
+    def __init__(
+        self,
+        room: rtc.Room,
+        call_id: str,
+        *,
+        output_dir: str = RECORDINGS_DIR,
+        memory: Optional[SessionMemory] = None,
+        metadata: Optional[dict] = None,
+    ):
+        self.room = room
+        self.call_id = call_id
+        self.output_dir = output_dir
+        self.memory = memory
+        self.metadata = metadata or {}
+        self.started_at = datetime.now()
+        self._encoders: dict[str, TrackEncoder] = {}
+        self._tasks: set[asyncio.Task] = set()
+        os.makedirs(output_dir, exist_ok=True)
+
+    def start(self) -> None:
+        """Tap tracks already in the room and any published later"""
+        for participant in self.room.remote_participants.values():
+            for publication in participant.track_publications.values():
+                if publication.track and publication.kind == rtc.TrackKind.KIND_AUDIO:
+                    self._tap(publication.track, participant.identity)
+        for publication in self.room.local_participant.track_publications.values():
+            if publication.track and publication.kind == rtc.TrackKind.KIND_AUDIO:
+                self._tap(publication.track, "agent")
+
+        self.room.on("track_subscribed", self._on_track_subscribed)
+        self.room.on("local_track_published", self._on_local_track_published)
+        logger.info(f"Recording call {self.call_id} to {self.output_dir}")
+
+    def _on_track_subscribed(self, track, publication, participant) -> None:
+        if track.kind == rtc.TrackKind.KIND_AUDIO:
+            self._tap(track, participant.identity)
+
+    def _on_local_track_published(self, publication, track) -> None:
+        if track.kind == rtc.TrackKind.KIND_AUDIO:
+            self._tap(track, "agent")
+
+    def _tap(self, track: rtc.Track, label: str) -> None:
+        if track.sid in self._encoders:
+            return
+        safe_label = "".join(c if c.isalnum() or c in "-_" else "_" for c in label)
+        path = os.path.join(self.output_dir, f"{self.call_id}_{safe_label}.ogg")
+        encoder = TrackEncoder(path, memory=self.memory)
+        self._encoders[track.sid] = encoder
+
+        async def pump() -> None:
+            stream = rtc.AudioStream.from_track(track=track, sample_rate=SAMPLE_RATE, num_channels=1)
+            try:
+                async for ev in stream:
+                    encoder.push(bytes(ev.frame.data))
+            finally:
+                await stream.aclose()
+
+        task = asyncio.create_task(pump())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def stop(self) -> dict:
+        """Stop tapping, finish encoding off the event loop and append to the index"""
+        self.room.off("track_subscribed", self._on_track_subscribed)
+        self.room.off("local_track_published", self._on_local_track_published)
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        encoders = list(self._encoders.values())
+        await asyncio.gather(*(asyncio.to_thread(e.close) for e in encoders))
+
+        entry = {
+            "call_id": self.call_id,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "duration_s": round((datetime.now() - self.started_at).total_seconds(), 1),
+            "files": [os.path.basename(e.path) for e in encoders],
+            "bytes": sum(os.path.getsize(e.path) for e in encoders if os.path.exists(e.path)),
+            "frames_dropped": sum(e.frames_dropped for e in encoders),
+            "encode_cpu_s": round(sum(e.cpu_seconds for e in encoders), 3),
+            **self.metadata,
+        }
+        with open(os.path.join(self.output_dir, "index.jsonl"), "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        logger.info(f"Recording finished: {entry}")
+        return entry
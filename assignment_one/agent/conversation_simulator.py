@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Text-only conversation simulator for prompt regression
+
+Runs a persona's instructions and greeting (see persona_registry.py) against
+debtor profiles from assignment_two/data/test_agents.json, with no audio and no
+phone call. Debtors are either scripted (their speech patterns, replayed in a
+seeded order) or LLM-driven (the same profile prompt the assignment_two
+simulator uses). Hundreds of conversations run concurrently under asyncio.
+
+Prompt regression needs --backend openai: the fake backend ignores the agent
+prompt, so its outcomes depend only on the debtor profile. It is a free check
+of the plumbing (personas, debtors, caching, concurrency), not of prompts.
+
+Results are cached on disk keyed by (prompt and LLM settings hash, debtor,
+seed, backend), so re-running an unchanged persona is free and only edited
+ones are re-simulated.
+
+Usage:
+    python conversation_simulator.py [--persona anjali] [--runs 50] [--backend fake|openai]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional, Protocol
+
+from dotenv import load_dotenv
+
+from persona_registry import Persona, PersonaRegistry
+
+load_dotenv()
+logger = logging.getLogger("conversation-simulator")
+
+AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEBTORS_FILE = os.path.join(AGENT_DIR, "..", "..", "assignment_two", "data", "test_agents.json")
+CACHE_DIR = os.path.join(AGENT_DIR, ".sim_cache")
+
+PAYMENT_COMMITTED = "payment_committed"
+REFUSED = "refused"
+CALLBACK = "callback"
+UNRESOLVED = "unresolved"
+
+# Debtor phrases that end the call with a clear outcome. Refusals are checked
+# first so "I'm not paying, I'll pay a lawyer" is not read as a commitment
+OUTCOME_PATTERNS = [
+    (REFUSED, re.compile(r"\b(not paying|won't pay|stop calling|lawyer|don't call)\b", re.I)),
+    (PAYMENT_COMMITTED, re.compile(r"\b(i can pay|i'll pay|i will pay|i can do \$|set that up)\b", re.I)),
+    (CALLBACK, re.compile(r"\b(call (me )?back|call later|bad time)\b", re.I)),
+]
+
+
+class LLMBackend(Protocol):
+    name: str
+
+    async def complete(
+        self, messages: list[dict], *, seed: int, temperature: float, model: Optional[str] = None
+    ) -> str: ...
+
+
+class FakeLLM:
+    """
+    Deterministic local backend for fast, free plumbing and throughput runs.
+    Agent lines are canned and ignore the prompt, so use a real backend to
+    compare prompts
+    """
+
+    name = "fake"
+
+    AGENT_LINES = [
+        "This is Anjali from SecureBank, calling about your credit card account.",
+        "Your payment is overdue. Can we find a solution together?",
+        "What amount could you manage this week?",
+        "How about a smaller payment on Friday and the rest next week?",
+        "I understand. Would a payment plan make this easier?",
+    ]
+    REPEAT = "Sorry, could you repeat that?"
+    DEBTOR_LINES = {
+        "high": ["Oh, okay. Yes, that's me.", "I know, I'm sorry about that.", "I can pay $150 on Friday."],
+        "medium": ["Yeah, who's this?", "Money's tight right now.", "Can you call me back next week?"],
+        "low": ["Who gave you this number?", "This isn't a good time.", "I'm not paying anything, stop calling."],
+    }
+
+    async def complete(
+        self, messages: list[dict], *, seed: int, temperature: float, model: Optional[str] = None
+    ) -> str:
+        await asyncio.sleep(0)  # yield like a network call would
+        system = messages[0]["content"]
+        level = re.search(r"Your general attitude: (\w+)", system)
+        said = [m["content"] for m in messages if m["role"] == "assistant"]
+        rng = random.Random(f"{seed}:{len(said)}")
+
+        if not level:
+            return self.AGENT_LINES[min(len(said), len(self.AGENT_LINES) - 1)]
+
+        lines = self.DEBTOR_LINES.get(level.group(1).lower(), self.DEBTOR_LINES["medium"])
+        progress = sum(1 for line in said if line != self.REPEAT)
+        # A little seeded variation so not every run of a profile is identical
+        if progress < len(lines) - 1 and rng.random() < 0.2:
+            return self.REPEAT
+        return lines[min(progress, len(lines) - 1)]
+
+
+class OpenAIBackend:
+    """
+    Real backend using the same OpenAI account as the voice agent. `model` is
+    the debtor's model; agent turns pass the persona's model per call
+    """
+
+    def __init__(self, model: str = "gpt-4o-mini", max_tokens: int = 80):
+        from openai import AsyncOpenAI
+
+        self.name = f"openai:{model}"
+        self.model = model
+        self.max_tokens = max_tokens
+        self.client = AsyncOpenAI()
+
+    async def complete(
+        self, messages: list[dict], *, seed: int, temperature: float, model: Optional[str] = None
+    ) -> str:
+        response = await self.client.chat.completions.create(
+            model=model or self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=self.max_tokens,
+            seed=seed,
+        )
+        return response.choices[0].message.content.strip()
+
+
+def debtor_prompt(debtor: dict) -> str:
+    """Profile prompt matching assignment_two's getCustomerResponse"""
+    return (
+        f"You are {debtor['name']}, answering a call like a real, busy human.\n\n"
+        f"Your situation:\n- Background: {debtor.get('background', '')}\n"
+        f"- Financial situation: {debtor.get('financial_situation', '')}\n"
+        f"- Personality: {', '.join(debtor.get('personality_traits', []))}\n\n"
+        f"How you communicate: {debtor.get('communication_style', '')}\n"
+        f"Your general attitude: {debtor.get('cooperation_level', 'Medium')}\n"
+        f"Your typical speech patterns: {' / '.join(debtor.get('speech_patterns', []))}\n\n"
+        "This is a PHONE CALL. Give a very short response (3-15 words). If you agree to "
+        "pay, say the amount and day. If you refuse, say so. If you want a call back, say so."
+    )
+
+
+@dataclass
+class SimulationResult:
+    persona: str
+    debtor: str
+    seed: int
+    outcome: str
+    turns: int
+    transcript: list[dict] = field(default_factory=list)
+    cached: bool = False
+
+
+def classify(debtor_line: str) -> Optional[str]:
+    for outcome, pattern in OUTCOME_PATTERNS:
+        if pattern.search(debtor_line):
+            return outcome
+    return None
+
+
+async def simulate_conversation(
+    persona: Persona,
+    debtor: dict,
+    seed: int,
+    backend: LLMBackend,
+    scripted: bool = False,
+    max_turns: int = 12,
+) -> SimulationResult:
+    """One call: agent greets, then agent and debtor alternate until an outcome"""
+    rng = random.Random(seed)
+    instructions = persona.instructions(customer_name=debtor["name"].split()[0])
+    greeting = persona.greeting_text(customer_full_name=debtor["name"])
+    script = list(debtor.get("speech_patterns", []))
+    rng.shuffle(script)
+
+    transcript = [{"role": "agent", "text": greeting}]
+    outcome = UNRESOLVED
+
+    for turn in range(max_turns):
+        if scripted:
+            if turn >= len(script):
+                break
+            debtor_line = script[turn]
+        else:
+            # The debtor sees the agent as the "user" and itself as the "assistant"
+            debtor_messages = [{"role": "system", "content": debtor_prompt(debtor)}] + [
+                {"role": "user" if m["role"] == "agent" else "assistant", "content": m["text"]}
+                for m in transcript
+            ]
+            debtor_line = await backend.complete(debtor_messages, seed=seed, temperature=0.8)
+        transcript.append({"role": "debtor", "text": debtor_line})
+
+        if result := classify(debtor_line):
+            outcome = result
+            break
+
+        agent_messages = [{"role": "system", "content": instructions}] + [
+            {"role": "assistant" if m["role"] == "agent" else "user", "content": m["text"]}
+            for m in transcript
+        ]
+        # The agent runs on the persona's own model, as it does on a real call
+        agent_line = await backend.complete(
+            agent_messages,
+            seed=seed,
+            temperature=persona.llm.get("temperature", 0.3),
+            model=persona.llm.get("model"),
+        )
+        transcript.append({"role": "agent", "text": agent_line})
+
+    return SimulationResult(
+        persona=persona.id,
+        debtor=debtor["name"],
+        seed=seed,
+        outcome=outcome,
+        turns=sum(1 for m in transcript if m["role"] == "debtor"),
+        transcript=transcript,
+    )
+
+
+def cache_key(persona: Persona, debtor: dict, seed: int, backend: LLMBackend, scripted: bool) -> str:
+    # Model and temperature change results as much as the prompt does
+    prompt_hash = hashlib.sha256(
+        (
+            persona.prompt.template
+            + persona.greeting.template
+            + json.dumps(persona.defaults, sort_keys=True)
+            + json.dumps(persona.llm, sort_keys=True)
+        ).encode()
+    ).hexdigest()[:16]
+    # Agent turns come from the backend in scripted mode too
+    mode = f"{backend.name}|scripted" if scripted else backend.name
+    raw = f"{prompt_hash}|{debtor['name']}|{seed}|{mode}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:24]
+
+
+class ResultCache:
+    """One JSON file per simulated conversation"""
+
+    def __init__(self, directory: str = CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[SimulationResult]:
+        path = os.path.join(self.directory, f"{key}.json")
+        try:
+            with open(path) as f:
+                return SimulationResult(**json.load(f), cached=True)
+        except (OSError, json.JSONDecodeError, TypeError):
+            return None
+
+    def put(self, key: str, result: SimulationResult) -> None:
+        data = asdict(result)
+        data.pop("cached")
+        path = os.path.join(self.directory, f"{key}.json")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+
+async def run_simulations(
+    persona: Persona,
+    debtors: list[dict],
+    runs: int,
+    backend: LLMBackend,
+    concurrency: int = 100,
+    scripted: bool = False,
+    cache: Optional[ResultCache] = None,
+) -> list[SimulationResult]:
+    """Simulate `runs` conversations per debtor, at most `concurrency` at once"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(debtor: dict, seed: int) -> SimulationResult:
+        key = cache_key(persona, debtor, seed, backend, scripted)
+        if cache and (hit := cache.get(key)):
+            return hit
+        async with semaphore:
+            result = await simulate_conversation(persona, debtor, seed, backend, scripted)
+        if cache:
+            cache.put(key, result)
+        return result
+
+    return await asyncio.gather(
+        *(run_one(debtor, seed) for debtor in debtors for seed in range(runs))
+    )
+
+
+def summarize(results: list[SimulationResult]) -> dict:
+    """Aggregate outcome rates and turn counts, overall and per debtor"""
+
+    def stats(group: list[SimulationResult]) -> dict:
+        turns = sorted(r.turns for r in group)
+        outcomes: dict[str, int] = {}
+        for r in group:
+            outcomes[r.outcome] = outcomes.get(r.outcome, 0) + 1
+        return {
+            "conversations": len(group),
+            "outcomes": {k: round(v / len(group), 3) for k, v in sorted(outcomes.items())},
+            "turns_mean": round(sum(turns) / len(turns), 2),
+            "turns_p95": turns[min(int(len(turns) * 0.95), len(turns) - 1)],
+        }
+
+    by_debtor: dict[str, list[SimulationResult]] = {}
+    for r in results:
+        by_debtor.setdefault(r.debtor, []).append(r)
+
+    return {
+        "overall": stats(results),
+        "by_debtor": {name: stats(group) for name, group in by_debtor.items()},
+        "cache_hits": sum(r.cached for r in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate debt collection calls in text mode")
+    parser.add_argument("--persona", default=None, help="persona id from personas/")
+    parser.add_argument("--debtors", default=DEBTORS_FILE, help="test_agents.json-style file")
+    parser.add_argument("--runs", type=int, default=50, help="conversations per debtor")
+    parser.add_argument("--backend", choices=["fake", "openai"], default="fake")
+    parser.add_argument(
+        "--model",
+        default="gpt-4o-mini",
+        help="debtor model for --backend openai; the agent uses the persona's model",
+    )
+    parser.add_argument("--scripted", action="store_true", help="replay debtor speech patterns")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    persona = PersonaRegistry().get(args.persona)
+    with open(args.debtors) as f:
+        debtors = json.load(f)
+    backend = FakeLLM() if args.backend == "fake" else OpenAIBackend(args.model)
+    cache = None if args.no_cache else ResultCache()
+
+    print(f"🎭 Persona: {persona.id} | 👥 {len(debtors)} debtors x {args.runs} runs | 🤖 {backend.name}")
+    if isinstance(backend, FakeLLM):
+        print("⚠️  The fake backend ignores the agent prompt: use --backend openai to compare prompts")
+    start = time.perf_counter()
+    results = asyncio.run(
+        run_simulations(persona, debtors, args.runs, backend, args.concurrency, args.scripted, cache)
+    )
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps(summarize(results), indent=2))
+    print(f"⏱️  {len(results)} conversations in {elapsed:.2f}s ({len(results) / elapsed:.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
-import json
 import logging
 import os
 from datetime import datetime
+from typing import Optional
 
 from dotenv import load_dotenv
 from livekit import api
@@ -10,77 +10,139 @@ from livekit.agents import (
     AgentSession,
     JobContext,
     JobProcess,
+    ModelSettings,
+    RoomIO,
     WorkerOptions,
     cli,
+    llm,
 )
-from livekit.plugins import cartesia, deepgram, openai, silero
+from livekit.plugins import cartesia, deepgram, openai
+from barge_in import BargeInMonitor, PacedAudioOutput
+from call_context import CallContext, CallContextError, decode, for_job
+from call_recorder import CallRecorder
+from persona_registry import Persona, PersonaRegistry
+from session_memory import MemoryCaps, SessionMemory
+from shared_models import load_vad
+from tts_chunking import ClauseTokenizer, TurnLatencyTracker
+from voicemail_detector import MACHINE, detect_voicemail, leave_message_and_hang_up
 
 load_dotenv()
 logger = logging.getLogger("debt-collection-agent")
 
 
+# Dispatches addressed to the old per-persona worker names keep their persona
+AGENT_NAME_PERSONAS = {
+    "debt-collection-agent-indian-voice": "anjali_indian_voice",
+}
+
+
 class DebtCollectionAgent(Agent):
-    def __init__(self, is_outbound=True) -> None:
-        super().__init__(
-            instructions=(
-                "You are Anjali, a professional and polite debt collection representative from SecureBank. "
-                "Your role is to contact customers about overdue credit card payments in a respectful, "
-                "human-like manner. Key guidelines:\n\n"
-                "1. TONE: Be polite, professional, but persistent. Sound like a real human.\n"
-                "2. PURPOSE: You're calling about an overdue credit card payment.\n"
-                "3. APPROACH: Start with verification, explain the situation, offer solutions.\n"
-                "4. RESPONSES: Handle various customer reactions (denial, anger, payment promises).\n"
-                "5. CLOSURE: Always end with clear next steps.\n\n"
-                "CONVERSATION FLOW:\n"
-                "- Greet politely and identify yourself\n"
-                "- Verify you're speaking to the right person\n"
-                "- Explain the overdue payment situation\n"
-                "- Listen to their response and offer solutions\n"
-                "- Attempt to secure a payment commitment\n"
-                "- End with clear follow-up actions\n\n"
-                "Hello, am i speaking to Ritav?"
-                "[Wait for confirmation]"
-                "Hi Ritav, this is Anjali calling from SecureBank regarding your credit card account. Do you have a few minutes to speak with me about your account?"
-                "[Then proceed to verification if needed]"
-                "Remember: You're calling about a $2,847.32 overdue payment that's 45 days past due. "
-                "Be understanding but firm about the need for payment resolution."
-            ),
-        )
-        self.is_outbound = is_outbound
+    def __init__(
+        self,
+        persona: Persona,
+        call_context: Optional[CallContext] = None,
+        barge_in: Optional[BargeInMonitor] = None,
+        latency_tracker: Optional[TurnLatencyTracker] = None,
+    ) -> None:
+        self.template_values = call_context.template_values() if call_context else {}
+        super().__init__(instructions=persona.instructions(**self.template_values))
+        self.persona = persona
+        self.is_outbound = bool(call_context and call_context.is_outbound)
+        self.barge_in = barge_in
+        self.latency_tracker = latency_tracker
+
+    async def llm_node(
+        self,
+        chat_ctx: llm.ChatContext,
+        tools: list[llm.FunctionTool],
+        model_settings: ModelSettings,
+    ):
+        stream = Agent.default.llm_node(self, chat_ctx, tools, model_settings)
+        if self.barge_in:
+            # Count generated tokens so interruptions can report what was wasted
+            stream = self.barge_in.track_generation(stream)
+        if self.latency_tracker:
+            # Time-to-first-audio is measured from the first text delta
+            stream = self.latency_tracker.track_generation(stream)
+        async for chunk in stream:
+            yield chunk
 
     async def on_enter(self):
         # Greet immediately for both inbound and outbound calls
         await self.session.say(
-            "Hello, am i speaking to Ritav Das?",
+            self.persona.greeting_text(**self.template_values),
             allow_interruptions=True,
         )
 
 
 def prewarm(proc: JobProcess):
     """Prewarm function to initialize resources"""
-    # Initialize VAD for voice activity detection
-    proc.userdata["vad"] = silero.VAD.load()
+    # Persona configs are hot-reloaded from personas/ for every new call
+    proc.userdata["personas"] = PersonaRegistry()
+    # VADs are preloaded in the forkserver and shared copy-on-write across jobs;
+    # this only loads ones for personas added since the worker started
+    for persona in proc.userdata["personas"].all():
+        load_vad(**persona.vad)
+
+
+async def start_egress_recording(ctx: JobContext, filename: str):
+    """Room composite recording through LiveKit Egress, stopped at shutdown"""
+    try:
+        # Create directory if it doesn't exist
+        os.makedirs("../recordings", exist_ok=True)
+
+        # Create room composite recording request (proper format)
+        recording_request = api.RoomCompositeEgressRequest(
+            room_name=ctx.room.name,
+            layout="speaker",  # Simple layout for debt collection
+            audio_only=True,  # Audio only recording
+            file_outputs=[
+                api.EncodedFileOutput(
+                    filepath=f"recordings/{filename}.mp4"  # Relative path from LiveKit
+                )
+            ],
+        )
+
+        recording = await ctx.api.egress.start_room_composite_egress(
+            recording_request
+        )
+        recording_id = recording.egress_id
+        logger.info(f"Started recording: {recording_id}")
+
+    except Exception as e:
+        logger.error(f"Failed to start recording: {e}")
+        return
+
+    # Stop recording when the job ends
+    async def stop_recording():
+        try:
+            await ctx.api.egress.stop_egress(
+                api.StopEgressRequest(egress_id=recording_id)
+            )
+            logger.info(f"Stopped recording: {recording_id}")
+        except Exception as e:
+            logger.error(f"Failed to stop recording: {e}")
+
+    ctx.add_shutdown_callback(stop_recording)
 
 
 async def entrypoint(ctx: JobContext):
     """Main entrypoint for the debt collection voice agent"""
 
-    # Check if this is an outbound call by looking for phone number in metadata
-    is_outbound = False
-    phone_number = None
-
+    # Typed, validated call context from the dispatch metadata (decoded once per job)
     try:
-        if ctx.job.metadata:
-            dial_info = json.loads(ctx.job.metadata)
-            phone_number = dial_info.get("phone_number")
-            if phone_number:
-                is_outbound = True
-                logger.info(f"Outbound call detected for {phone_number}")
-    except (json.JSONDecodeError, KeyError):
-        logger.info("No phone number in metadata, treating as inbound call")
+        call_context = for_job(ctx.job)
+    except CallContextError as e:
+        # Nobody will be dialed or join for a dispatch we can't read; free the slot
+        logger.error(f"Invalid job metadata, shutting down: {e}")
+        ctx.shutdown(reason="invalid job metadata")
+        return
+
+    phone_number = call_context.phone_number
 
     # If this is an outbound call, create the SIP participant first
-    if is_outbound and phone_number:
+    if call_context.is_outbound:
+        logger.info(f"Outbound call detected for {phone_number}")
         try:
             trunk_id = os.getenv("LIVEKIT_SIP_TRUNK_ID")
 
@@ -99,78 +161,121 @@ async def entrypoint(ctx: JobContext):
             logger.error(f"Error creating SIP participant: {e.message}")
             ctx.shutdown()
             return
+
+        # Don't run the full STT/LLM/TTS pipeline against an answering machine
+        if os.getenv("VOICEMAIL_DETECTION", "true").lower() == "true":
+            await ctx.connect()
+            participant = await ctx.wait_for_participant(
+                identity=f"caller-{phone_number}"
+            )
+            detection = await detect_voicemail(participant)
+            if detection.verdict == MACHINE:
+                await leave_message_and_hang_up(
+                    ctx, participant, detection, os.getenv("VOICEMAIL_MESSAGE_PATH")
+                )
+                return
     else:
         # For inbound calls, wait for participant to connect
-        await ctx.wait_for_participant()
+        participant = await ctx.wait_for_participant()
+
+        # Rooms dialed by OutboundCaller carry the call context on the SIP participant
+        if participant.metadata and not ctx.job.metadata:
+            try:
+                call_context = decode(participant.metadata)
+                phone_number = call_context.phone_number
+            except CallContextError as e:
+                logger.warning(f"Ignoring participant metadata: {e}")
+
+    # Snapshot the persona now so a config reload never changes a live call
+    persona_id = call_context.persona or AGENT_NAME_PERSONAS.get(ctx.job.agent_name)
+    persona = ctx.proc.userdata["personas"].get(persona_id)
+    logger.info(f"Using persona '{persona.id}' ({persona.name})")
 
     logger.info("Participant connected, starting debt collection agent")
 
-    # Start call recording - COMMENTED OUT FOR NOW
-    recording_id = None
-    if phone_number:  # Only record actual phone calls
-        try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"debt_call_{phone_number}_{timestamp}"
-
-            # Create directory if it doesn't exist
-            os.makedirs("../recordings", exist_ok=True)
-
-            # Create room composite recording request (proper format)
-            recording_request = api.RoomCompositeEgressRequest(
-                room_name=ctx.room.name,
-                layout="speaker",  # Simple layout for debt collection
-                audio_only=True,  # Audio only recording
-                file_outputs=[
-                    api.EncodedFileOutput(
-                        filepath=f"recordings/{filename}.mp4"  # Relative path from LiveKit
-                    )
-                ],
-            )
+    # Account for (and cap) transcript, chat context and audio buffer memory
+    session_memory = SessionMemory(ctx.room.name, MemoryCaps.from_env())
 
-            recording = await ctx.api.egress.start_room_composite_egress(
-                recording_request
+    # Record the call: in-worker Opus encoding by default, RECORDING_MODE=egress
+    # for a LiveKit room composite
+    if phone_number and persona.record_calls:  # Only record actual phone calls
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"debt_call_{phone_number}_{timestamp}"
+
+        if os.getenv("RECORDING_MODE", "local") == "egress":
+            await start_egress_recording(ctx, filename)
+        else:
+            await ctx.connect()
+            recorder = CallRecorder(
+                ctx.room,
+                filename,
+                memory=session_memory,
+                metadata={"phone_number": phone_number, "persona": persona.id},
             )
-            recording_id = recording.egress_id
-            logger.info(f"Started recording: {recording_id}")
+            recorder.start()
+            ctx.add_shutdown_callback(recorder.stop)
 
-        except Exception as e:
-            logger.error(f"Failed to start recording: {e}")
+    # Clause-level chunking into TTS; set TTS_CHUNKING=default to compare
+    chunking_mode = os.getenv("TTS_CHUNKING", "clause")
+    tts_chunking_kwargs = (
+        {"tokenizer": ClauseTokenizer()} if chunking_mode == "clause" else {}
+    )
 
-    # Create agent session with Deepgram STT and OpenAI LLM/TTS
-    session = AgentSession(
-        vad=ctx.proc.userdata["vad"],
-        stt=deepgram.STT(
-            model="nova-2-general",  # Optimized for phone call audio quality
-            language="en",
-            smart_format=False,  # Auto-format numbers, dates, etc.
-            punctuate=False,  # Add punctuation for better LLM processing
-        ),
-        llm=openai.LLM(
-            model="gpt-4o",  # Much faster than gpt-4o
-            temperature=0.3,  # Lower temperature for faster generation
-        ),
-        tts=cartesia.TTS(
-            model="sonic-2",
-            voice="f6141af3-5f94-418c-80ed-a45d450e7e2e",  # Indian lady voice ID
-            language="en",
-        ),
+    # Barge-in fast path: pause on the first caller speech, interrupt after a
+    # short minimum so a cough or an "mm-hmm" only pauses the agent
+    fast_path = os.getenv("BARGE_IN_FAST_PATH", "true").lower() == "true"
+    barge_in_kwargs = (
+        {"min_interruption_duration": float(os.getenv("BARGE_IN_MIN_SPEECH_MS", 200)) / 1000}
+        if fast_path
+        else {}
     )
 
-    # Start the agent session
-    await session.start(
-        agent=DebtCollectionAgent(is_outbound=is_outbound),
-        room=ctx.room,
+    # Create agent session with Deepgram STT, OpenAI LLM and Cartesia TTS
+    session = AgentSession(
+        vad=load_vad(**persona.vad),
+        stt=deepgram.STT(**persona.stt),
+        llm=openai.LLM(**persona.llm),
+        tts=cartesia.TTS(**persona.tts, **tts_chunking_kwargs),
+        **barge_in_kwargs,
     )
 
-    # Stop recording when session ends
-    if recording_id:
-        try:
-            await ctx.api.egress.stop_egress(
-                api.StopEgressRequest(egress_id=recording_id)
-            )
-            logger.info(f"Stopped recording: {recording_id}")
-        except Exception as e:
-            logger.error(f"Failed to stop recording: {e}")
+    # Log time-to-first-audio for every LLM turn
+    latency_tracker = TurnLatencyTracker(chunking_mode)
+    latency_tracker.attach(session)
+
+    async def log_latency_summary():
+        logger.info(latency_tracker.summary())
+
+    ctx.add_shutdown_callback(log_latency_summary)
+
+    session_memory.attach(session)
+
+    async def log_memory_report():
+        logger.info(f"Session memory: {session_memory.report()}")
+
+    ctx.add_shutdown_callback(log_memory_report)
+
+    # Room IO is started here rather than by session.start so the barge-in
+    # fast path can sit in front of the room audio before the greeting plays;
+    # set BARGE_IN_FAST_PATH=false to measure the default interruption path
+    await ctx.connect()
+    room_io = RoomIO(session, room=ctx.room)
+    await room_io.start()
+    if fast_path and session.output.audio is not None:
+        session.output.audio = PacedAudioOutput(session.output.audio)
+    barge_in = BargeInMonitor(session, session.output.audio, fast_path=fast_path)
+    barge_in.attach()
+
+    async def close_room_io():
+        logger.info(f"Barge-in: {barge_in.summary()}")
+        if isinstance(session.output.audio, PacedAudioOutput):
+            await session.output.audio.aclose()
+        await room_io.aclose()
+
+    ctx.add_shutdown_callback(close_room_io)
+
+    # Start the agent session
+    await session.start(agent=DebtCollectionAgent(persona, call_context, barge_in, latency_tracker))
 
 
 if __name__ == "__main__":
@@ -178,6 +283,8 @@ if __name__ == "__main__":
         WorkerOptions(
             entrypoint_fnc=entrypoint,
             prewarm_fnc=prewarm,
+            job_memory_warn_mb=float(os.getenv("JOB_MEMORY_WARN_MB", 500)),
+            job_memory_limit_mb=float(os.getenv("JOB_MEMORY_LIMIT_MB", 0)),
             agent_name="debt-collection-agent",  # Enable explicit dispatch
         ),
     )
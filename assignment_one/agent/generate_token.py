@@ -4,9 +4,10 @@ Generate a room token for testing the debt collection agent
 """
 
 import os
-from livekit import api
 from dotenv import load_dotenv
 
+from token_service import TokenService
+
 load_dotenv()
 
 def generate_room_token(room_name="test-debt-collection", participant_name="Test User"):
@@ -22,15 +23,9 @@ def generate_room_token(room_name="test-debt-collection", participant_name="Test
         return None
     
     # Generate token
-    token = api.AccessToken(api_key, api_secret) \
-        .with_identity(participant_name) \
-        .with_name(participant_name) \
-        .with_grants(api.VideoGrants(
-            room_join=True,
-            room=room_name,
-            can_publish=True,
-            can_subscribe=True,
-        )).to_jwt()
+    token = TokenService(api_key, api_secret).mint(
+        participant_name, room_name, name=participant_name
+    )
     
     print(f"🎯 Room: {room_name}")
     print(f"🌐 LiveKit URL: {livekit_url}")
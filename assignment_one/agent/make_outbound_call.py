@@ -7,18 +7,35 @@ import asyncio
 import logging
 import os
 import random
+from dataclasses import replace
+from typing import Optional
 
 from dotenv import load_dotenv
 from livekit import api
 
+from call_context import CallContext, CallContextError
+
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("outbound-caller")
 
 
-async def make_outbound_call(phone_number: str):
+async def make_outbound_call(
+    phone_number: str,
+    persona: Optional[str] = None,
+    call_context: Optional[CallContext] = None,
+):
     """Make an outbound call to the specified phone number"""
 
+    # Validate the context here so a bad dispatch fails before any room exists
+    call_context = call_context or CallContext()
+    call_context = replace(
+        call_context,
+        phone_number=phone_number,
+        persona=persona or call_context.persona,
+    )
+    phone_number = call_context.phone_number  # normalized to E.164
+
     livekit_api = api.LiveKitAPI(
         url=os.getenv("LIVEKIT_URL"),
         api_key=os.getenv("LIVEKIT_API_KEY"),
@@ -30,6 +47,8 @@ async def make_outbound_call(phone_number: str):
 
     print(f"📞 Making outbound call to {phone_number}")
     print(f"🏠 Room: {room_name}")
+    if persona:
+        print(f"🎭 Persona: {persona}")
     print("=" * 50)
 
     try:
@@ -38,7 +57,7 @@ async def make_outbound_call(phone_number: str):
             api.CreateAgentDispatchRequest(
                 agent_name="debt-collection-agent",
                 room=room_name,
-                metadata=f'{{"phone_number": "{phone_number}"}}',
+                metadata=call_context.encode(),
             )
         )
 
@@ -57,19 +76,24 @@ async def main():
     """Main function"""
     import sys
 
-    if len(sys.argv) != 2:
-        print("Usage: python make_outbound_call.py <phone_number>")
-        print("Example: python make_outbound_call.py +919650098052")
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python make_outbound_call.py <phone_number> [persona]")
+        print("Example: python make_outbound_call.py +919650098052 anjali_indian_voice")
         sys.exit(1)
 
     phone_number = sys.argv[1]
+    persona = sys.argv[2] if len(sys.argv) == 3 else None
 
     # Validate phone number format
     if not phone_number.startswith("+"):
         print("❌ Phone number must be in international format (e.g., +919650098052)")
         sys.exit(1)
 
-    dispatch_id = await make_outbound_call(phone_number)
+    try:
+        dispatch_id = await make_outbound_call(phone_number, persona)
+    except CallContextError as e:
+        print(f"❌ Invalid call details: {e}")
+        sys.exit(1)
 
     if dispatch_id:
         print(f"\n🎉 Call initiated successfully!")
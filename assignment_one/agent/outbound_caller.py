@@ -6,6 +6,8 @@ from typing import Optional
 from dotenv import load_dotenv
 from livekit import api
 
+from call_context import CallContext
+
 load_dotenv()
 
 logger = logging.getLogger("outbound-caller")
@@ -41,8 +43,18 @@ class OutboundCaller:
             Room name for the call
         """
 
+        # Same versioned context the agent worker decodes from job metadata
+        call_context = CallContext(
+            phone_number=phone_number,
+            customer_full_name=customer_name,
+            account_last_four=account_last_four,
+            amount_due=amount_due,
+            days_overdue=days_overdue,
+        )
+        phone_number = call_context.phone_number  # normalized to E.164
+
         # Create a room for the call
-        room_name = f"debt-collection-{phone_number.replace('+', '').replace('-', '')}"
+        room_name = f"debt-collection-{phone_number.replace('+', '')}"
 
         logger.info(f"Creating room: {room_name}")
 
@@ -66,7 +78,7 @@ class OutboundCaller:
                     room_name=room_name,
                     participant_identity=f"caller-{phone_number}",
                     participant_name=customer_name or f"Customer {phone_number}",
-                    participant_metadata=f"account_last_four={account_last_four},amount_due={amount_due},days_overdue={days_overdue}",
+                    participant_metadata=call_context.encode(),
                     dtmf="",  # No DTMF for initial call
                     play_ringtone=True,
                 )
@@ -0,0 +1,131 @@
+"""
+Registry of agent personas loaded from JSON config files.
+
+Each file in personas/ follows the assignment_two main_agent.json layout
+("name" and "prompt") plus the pipeline settings that used to be hard-coded per
+worker script: greeting, template defaults, VAD, STT, LLM and TTS options.
+The file name (without .json) is the persona id that dispatches select.
+
+Files are re-read when their mtime changes. A call keeps the Persona snapshot it
+started with, so editing a prompt only affects calls that start afterwards and
+never drops a live one.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from string import Template
+from typing import Optional
+
+logger = logging.getLogger("persona-registry")
+
+PERSONAS_DIR = os.getenv(
+    "PERSONAS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "personas")
+)
+DEFAULT_PERSONA = os.getenv("DEFAULT_PERSONA", "anjali")
+
+
+@dataclass(frozen=True)
+class Persona:
+    id: str
+    name: str
+    prompt: Template
+    greeting: Template
+    defaults: dict = field(default_factory=dict)
+    record_calls: bool = True
+    vad: dict = field(default_factory=dict)
+    stt: dict = field(default_factory=dict)
+    llm: dict = field(default_factory=dict)
+    tts: dict = field(default_factory=dict)
+    version: float = 0.0  # mtime of the file this snapshot was loaded from
+
+    def instructions(self, **values) -> str:
+        return self.prompt.safe_substitute({**self.defaults, **values})
+
+    def greeting_text(self, **values) -> str:
+        return self.greeting.safe_substitute({**self.defaults, **values})
+
+
+def load_persona(path: str) -> Persona:
+    """Parse one persona file; templates are compiled once here and reused per call"""
+    with open(path) as f:
+        config = json.load(f)
+
+    return Persona(
+        id=os.path.splitext(os.path.basename(path))[0],
+        name=config["name"],
+        prompt=Template(config["prompt"]),
+        greeting=Template(config.get("greeting", "")),
+        defaults={k: str(v) for k, v in config.get("defaults", {}).items()},
+        record_calls=config.get("record_calls", True),
+        vad=config.get("vad", {}),
+        stt=config.get("stt", {}),
+        llm=config.get("llm", {}),
+        tts=config.get("tts", {}),
+        version=os.path.getmtime(path),
+    )
+
+
+class PersonaRegistry:
+    """Thread-safe persona cache that hot-reloads changed files"""
+
+    def __init__(self, directory: str = PERSONAS_DIR, reload_interval: float = 2.0):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self._personas: dict[str, Persona] = {}
+        self._lock = threading.Lock()
+        self._last_scan = 0.0
+        self.reload(force=True)
+
+    def get(self, persona_id: Optional[str] = None) -> Persona:
+        """Return the current snapshot of a persona, falling back to the default"""
+        self.reload()
+        persona_id = persona_id or DEFAULT_PERSONA
+        persona = self._personas.get(persona_id)
+        if persona is None:
+            logger.warning(f"Unknown persona '{persona_id}', using '{DEFAULT_PERSONA}'")
+            persona = self._personas[DEFAULT_PERSONA]
+        return persona
+
+    def all(self) -> list[Persona]:
+        self.reload()
+        return list(self._personas.values())
+
+    def reload(self, force: bool = False) -> None:
+        """Re-read files whose mtime changed, at most once per reload_interval"""
+        now = time.monotonic()
+        if not force and now - self._last_scan < self.reload_interval:
+            return
+
+        with self._lock:
+            self._last_scan = now
+            personas = dict(self._personas)
+            seen = set()
+
+            for name in sorted(os.listdir(self.directory)):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.directory, name)
+                persona_id = os.path.splitext(name)[0]
+                seen.add(persona_id)
+
+                current = personas.get(persona_id)
+                if current and current.version == os.path.getmtime(path):
+                    continue
+                try:
+                    personas[persona_id] = load_persona(path)
+                    action = "Reloaded" if current else "Loaded"
+                    logger.info(f"{action} persona '{persona_id}' from {name}")
+                except (OSError, KeyError, json.JSONDecodeError) as e:
+                    # Keep serving the last good version while the file is being edited
+                    logger.error(f"Failed to load persona {name}: {e}")
+
+            for persona_id in set(personas) - seen:
+                logger.info(f"Removed persona '{persona_id}'")
+                del personas[persona_id]
+
+            # Swap the whole dict so readers never see a half-updated registry
+            self._personas = personas
@@ -0,0 +1,151 @@
+"""
+Per-session memory accounting for the debt collection agent.
+
+Tracks the bytes a call holds in audio buffers, chat context and transcripts,
+and keeps each of them under a cap so a long or chatty call can't grow without
+bound. Sizes are approximations (UTF-8 text length, raw PCM bytes), which is
+what matters for comparing calls and sizing hosts.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+import psutil
+from livekit.agents import llm
+
+logger = logging.getLogger("session-memory")
+
+AUDIO = "audio"
+CHAT_CTX = "chat_ctx"
+TRANSCRIPT = "transcript"
+
+
+@dataclass
+class MemoryCaps:
+    audio_bytes: int = 8 * 1024 * 1024  # ~4 minutes of 16kHz mono PCM
+    chat_ctx_bytes: int = 256 * 1024
+    chat_ctx_items: int = 80
+    transcript_bytes: int = 256 * 1024
+
+    @classmethod
+    def from_env(cls) -> "MemoryCaps":
+        caps = cls()
+        caps.audio_bytes = int(os.getenv("SESSION_AUDIO_CAP_KB", caps.audio_bytes // 1024)) * 1024
+        caps.chat_ctx_bytes = int(os.getenv("SESSION_CHAT_CTX_CAP_KB", caps.chat_ctx_bytes // 1024)) * 1024
+        caps.chat_ctx_items = int(os.getenv("SESSION_CHAT_CTX_MAX_ITEMS", caps.chat_ctx_items))
+        caps.transcript_bytes = int(os.getenv("SESSION_TRANSCRIPT_CAP_KB", caps.transcript_bytes // 1024)) * 1024
+        return caps
+
+
+def chat_ctx_size(chat_ctx: llm.ChatContext) -> int:
+    """Approximate bytes held by the text of a chat context"""
+    size = 0
+    for item in chat_ctx.items:
+        if isinstance(item, llm.ChatMessage):
+            size += len((item.text_content or "").encode())
+        elif isinstance(item, llm.FunctionCall):
+            size += len(item.arguments.encode())
+        elif isinstance(item, llm.FunctionCallOutput):
+            size += len(item.output.encode())
+    return size
+
+
+def process_memory() -> dict:
+    """RSS plus unique/proportional set size, which account for shared pages"""
+    info = psutil.Process().memory_full_info()
+    return {
+        "rss_mb": round(info.rss / 1e6, 1),
+        "uss_mb": round(info.uss / 1e6, 1),
+        "pss_mb": round(getattr(info, "pss", info.uss) / 1e6, 1),
+    }
+
+
+class SessionMemory:
+    """Byte accounting and caps for one call"""
+
+    def __init__(self, session_id: str, caps: Optional[MemoryCaps] = None):
+        self.session_id = session_id
+        self.caps = caps or MemoryCaps()
+        self.usage = {AUDIO: 0, CHAT_CTX: 0, TRANSCRIPT: 0}
+        self.peak = dict(self.usage)
+        self.transcript: deque[tuple[str, str]] = deque()
+        self.dropped_audio_bytes = 0
+        self._trim_tasks: set[asyncio.Task] = set()
+        # Audio is reserved on the event loop and released by encoder threads
+        self._audio_lock = threading.Lock()
+
+    def reserve_audio(self, nbytes: int) -> bool:
+        """Account for a buffered audio chunk; False means the cap would be exceeded"""
+        with self._audio_lock:
+            if self.usage[AUDIO] + nbytes > self.caps.audio_bytes:
+                self.dropped_audio_bytes += nbytes
+                return False
+            self._set(AUDIO, self.usage[AUDIO] + nbytes)
+            return True
+
+    def release_audio(self, nbytes: int) -> None:
+        """Thread-safe, encoder threads release what they have written"""
+        with self._audio_lock:
+            self._set(AUDIO, max(self.usage[AUDIO] - nbytes, 0))
+
+    def add_transcript(self, role: str, text: str) -> None:
+        """Append a line, dropping the oldest ones once over the cap"""
+        self.transcript.append((role, text))
+        size = self.usage[TRANSCRIPT] + len(text.encode())
+        while size > self.caps.transcript_bytes and len(self.transcript) > 1:
+            _, old = self.transcript.popleft()
+            size -= len(old.encode())
+        self._set(TRANSCRIPT, size)
+
+    def attach(self, session) -> None:
+        """Keep transcript and chat context accounting up to date for an AgentSession"""
+
+        def on_item_added(ev) -> None:
+            item = ev.item
+            if isinstance(item, llm.ChatMessage) and item.text_content:
+                self.add_transcript(item.role, item.text_content)
+
+            agent = session.current_agent
+            self._set(CHAT_CTX, chat_ctx_size(agent.chat_ctx))
+            if (
+                self.usage[CHAT_CTX] > self.caps.chat_ctx_bytes
+                or len(agent.chat_ctx.items) > self.caps.chat_ctx_items
+            ):
+                task = asyncio.create_task(self._trim_chat_ctx(agent))
+                self._trim_tasks.add(task)
+                task.add_done_callback(self._trim_tasks.discard)
+
+        session.on("conversation_item_added", on_item_added)
+
+    async def _trim_chat_ctx(self, agent) -> None:
+        chat_ctx = agent.chat_ctx.copy()
+        max_items = min(len(chat_ctx.items), self.caps.chat_ctx_items)
+        while max_items > 2:
+            chat_ctx.truncate(max_items=max_items)
+            if chat_ctx_size(chat_ctx) <= self.caps.chat_ctx_bytes:
+                break
+            max_items -= 2
+
+        await agent.update_chat_ctx(chat_ctx)
+        self._set(CHAT_CTX, chat_ctx_size(chat_ctx))
+        logger.info(
+            f"[{self.session_id}] trimmed chat context to {len(chat_ctx.items)} items"
+        )
+
+    def report(self) -> dict:
+        return {
+            "session_id": self.session_id,
+            "usage_kb": {k: round(v / 1024, 1) for k, v in self.usage.items()},
+            "peak_kb": {k: round(v / 1024, 1) for k, v in self.peak.items()},
+            "dropped_audio_kb": round(self.dropped_audio_bytes / 1024, 1),
+            "process": process_memory(),
+        }
+
+    def _set(self, category: str, nbytes: int) -> None:
+        self.usage[category] = nbytes
+        self.peak[category] = max(self.peak[category], nbytes)
@@ -0,0 +1,41 @@
+"""
+Models shared copy-on-write across job processes.
+
+LiveKit starts job processes from a forkserver on Linux and preloads every
+registered plugin package there. Registering this module as a plugin makes the
+forkserver import it, so the Silero models below are loaded once in the parent
+and every forked job process shares those pages instead of loading its own copy
+in prewarm.
+"""
+
+import logging
+
+from livekit.agents import Plugin
+from livekit.plugins import silero
+from persona_registry import PersonaRegistry
+
+logger = logging.getLogger("shared-models")
+
+_vads: dict[tuple, silero.VAD] = {}
+
+
+def load_vad(**options) -> silero.VAD:
+    """Return the shared VAD for these options, loading it only if not preloaded"""
+    key = tuple(sorted(options.items()))
+    if key not in _vads:
+        logger.info(f"Loading Silero VAD {options or '(defaults)'}")
+        _vads[key] = silero.VAD.load(**options)
+    return _vads[key]
+
+
+class SharedModelsPlugin(Plugin):
+    def __init__(self) -> None:
+        super().__init__("shared-models", "0.1.0", __name__, logger)
+
+
+# Preload the VAD settings of every persona before any job process forks.
+# Personas added later are loaded on first use in the job process.
+for _persona in PersonaRegistry().all():
+    load_vad(**_persona.vad)
+
+Plugin.register_plugin(SharedModelsPlugin())
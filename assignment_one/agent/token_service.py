@@ -0,0 +1,169 @@
+"""
+Bulk LiveKit access-token minting for supervisor and monitor UIs.
+
+api.AccessToken builds and signs one JWT at a time and re-derives the HMAC key
+for every signature. TokenService keeps the signing key and the encoded JWT
+header precomputed, mints tokens in batches, and caches still-valid tokens per
+(identity, room, grants) so repeated requests for the same room are free.
+Tokens are standard HS256 LiveKit tokens and verify with api.TokenVerifier.
+"""
+
+import base64
+import dataclasses
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from livekit import api
+from livekit.api.access_token import snake_to_lower_camel
+
+DEFAULT_TTL = 6 * 60 * 60  # same as api.AccessToken
+DEFAULT_REFRESH_MARGIN = 10 * 60  # re-mint tokens with less than this left
+
+
+# (attribute, JWT claim name) for every VideoGrants field, resolved once
+_GRANT_FIELDS = [(f.name, snake_to_lower_camel(f.name)) for f in dataclasses.fields(api.VideoGrants)]
+
+
+def _b64(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def room_grants(room: str) -> api.VideoGrants:
+    """Grants generate_room_token has always issued: join, publish, subscribe"""
+    return api.VideoGrants(room_join=True, room=room, can_publish=True, can_subscribe=True)
+
+
+def monitor_grants(room: str) -> api.VideoGrants:
+    """Listen-only, hidden grants for supervisors monitoring a live call"""
+    return api.VideoGrants(
+        room_join=True, room=room, can_publish=False, can_subscribe=True, hidden=True
+    )
+
+
+@dataclass(frozen=True)
+class TokenRequest:
+    identity: str
+    room: str
+    name: Optional[str] = None
+    monitor: bool = False
+
+
+class TokenService:
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        *,
+        ttl: int = DEFAULT_TTL,
+        refresh_margin: int = DEFAULT_REFRESH_MARGIN,
+        max_entries: int = 100_000,
+    ):
+        if not api_key or not api_secret:
+            raise ValueError("api_key and api_secret must be set")
+
+        self.api_key = api_key
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.max_entries = max_entries
+
+        # Precomputed once: the keyed HMAC state and the encoded JWT header
+        self._hmac = hmac.new(api_secret.encode(), digestmod=hashlib.sha256)
+        self._header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+
+        # All entries share one TTL, so insertion order is also expiry order
+        self._cache: OrderedDict[tuple, tuple[str, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "TokenService":
+        return cls(os.getenv("LIVEKIT_API_KEY"), os.getenv("LIVEKIT_API_SECRET"), **kwargs)
+
+    def mint(
+        self,
+        identity: str,
+        room: str,
+        *,
+        name: Optional[str] = None,
+        grants: Optional[api.VideoGrants] = None,
+    ) -> str:
+        """Return a cached token with enough validity left, or sign a new one"""
+        grants = grants or room_grants(room)
+        # Lists (can_publish_sources) become tuples so the values can key the cache
+        grant_values = tuple(
+            tuple(value) if isinstance(value, list) else value
+            for value in (getattr(grants, attr) for attr, _ in _GRANT_FIELDS)
+        )
+        key = (identity, room, name, grant_values)
+        now = int(time.time())
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[1] - now > self.refresh_margin:
+                self.hits += 1
+                return cached[0]
+
+        token, expires_at = self._sign(identity, name, grants, grant_values, now)
+
+        with self._lock:
+            self.misses += 1
+            self._cache.pop(key, None)
+            self._cache[key] = (token, expires_at)
+            self._evict(now)
+        return token
+
+    def mint_many(self, requests: Iterable[TokenRequest]) -> list[str]:
+        """Mint tokens for many rooms, in request order"""
+        return [
+            self.mint(
+                r.identity,
+                r.room,
+                name=r.name,
+                grants=monitor_grants(r.room) if r.monitor else None,
+            )
+            for r in requests
+        ]
+
+    def _sign(
+        self,
+        identity: str,
+        name: Optional[str],
+        grants: api.VideoGrants,
+        grant_values: tuple,
+        now: int,
+    ) -> tuple[str, int]:
+        if grants.room_join and (not identity or not grants.room):
+            raise ValueError("identity and room must be set when joining a room")
+
+        # Same claims AccessToken.to_jwt produces: None/empty values left out,
+        # nbf/exp in whole seconds
+        expires_at = now + self.ttl
+        claims = {"name": name} if name else {}
+        claims["video"] = {
+            claim: value
+            for (_, claim), value in zip(_GRANT_FIELDS, grant_values)
+            if value is not None and value != ""
+        }
+        claims.update({"sub": identity, "iss": self.api_key, "nbf": now, "exp": expires_at})
+
+        payload = _b64(json.dumps(claims, separators=(",", ":")).encode())
+        signing_input = self._header + b"." + payload
+        mac = self._hmac.copy()
+        mac.update(signing_input)
+        return (signing_input + b"." + _b64(mac.digest())).decode(), expires_at
+
+    def _evict(self, now: int) -> None:
+        """Drop expired or nearly expired tokens, then the oldest ones over capacity"""
+        while self._cache:
+            _, (_, expires_at) = next(iter(self._cache.items()))
+            if expires_at - now > self.refresh_margin and len(self._cache) <= self.max_entries:
+                break
+            self._cache.popitem(last=False)
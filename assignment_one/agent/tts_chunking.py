@@ -0,0 +1,221 @@
+"""
+Aggressive text chunking between the LLM and Cartesia TTS.
+
+The default segmentation waits for a full sentence before anything is sent to
+TTS, so a reply like "Hi Ritav, this is Anjali calling from SecureBank..." is
+silent until the whole first sentence has been generated. ClauseTokenizer
+flushes the first clause as soon as a natural break appears and then falls
+back to sentence-sized chunks, which Cartesia keeps synthesizing while the
+earlier audio is already playing.
+"""
+
+import logging
+import re
+import time
+from typing import AsyncIterable, Optional
+
+from livekit.agents import AgentSession, llm, metrics, tokenize, utils
+
+logger = logging.getLogger("tts-chunking")
+
+# Punctuation that ends a sentence or a clause, only counted as a break when
+# followed by whitespace so "$2,847.32" is never split
+SENTENCE_BREAK = re.compile(r"[.!?…]+[\"')\]]*\s+")
+CLAUSE_BREAK = re.compile(r"(?:[.!?…]+[\"')\]]*|[,;:—]|\s-)\s+")
+
+# Abbreviations that end in a period but never end a sentence
+ABBREVIATIONS = ("Mr.", "Mrs.", "Ms.", "Dr.", "St.", "vs.", "e.g.", "i.e.")
+
+
+def _find_break(text: str, pattern: re.Pattern, min_len: int) -> int:
+    """Return the end index of the first break at or after min_len, or -1"""
+    for match in pattern.finditer(text):
+        if match.start() + 1 < min_len:
+            continue
+        if text[: match.start() + 1].endswith(ABBREVIATIONS):
+            continue
+        return match.end()
+    return -1
+
+
+def split_clauses(
+    text: str, min_first_chunk_len: int = 8, min_chunk_len: int = 40
+) -> list[str]:
+    """Split text the same way ClauseStream would for a single pushed string"""
+    chunks = []
+    pattern, min_len = CLAUSE_BREAK, min_first_chunk_len
+
+    while text:
+        end = _find_break(text, pattern, min_len)
+        if end < 0:
+            break
+        chunks.append(text[:end].strip())
+        text = text[end:]
+        pattern, min_len = SENTENCE_BREAK, min_chunk_len
+
+    if text.strip():
+        chunks.append(text.strip())
+    return chunks
+
+
+class ClauseStream(tokenize.SentenceStream):
+    """Sentence stream that emits the first clause early, then whole sentences"""
+
+    def __init__(self, *, min_first_chunk_len: int, min_chunk_len: int) -> None:
+        super().__init__()
+        self._min_first_chunk_len = min_first_chunk_len
+        self._min_chunk_len = min_chunk_len
+        self._segment_id = utils.shortuuid()
+        self._buf = ""
+        self._first_sent = False
+        self._first_text_at: Optional[float] = None
+
+        # Seconds between the first pushed text and the first chunk sent to TTS
+        self.first_chunk_delay: Optional[float] = None
+
+    def push_text(self, text: str) -> None:
+        self._check_not_closed()
+        if self._first_text_at is None and text:
+            self._first_text_at = time.perf_counter()
+        self._buf += text
+
+        while self._buf:
+            if self._first_sent:
+                end = _find_break(self._buf, SENTENCE_BREAK, self._min_chunk_len)
+            else:
+                end = _find_break(self._buf, CLAUSE_BREAK, self._min_first_chunk_len)
+            if end < 0:
+                break
+
+            self._send(self._buf[:end])
+            self._buf = self._buf[end:]
+
+    def flush(self) -> None:
+        self._check_not_closed()
+        if self._buf.strip():
+            self._send(self._buf)
+
+        # A flush marks the end of a TTS segment, so the next one starts eagerly again
+        self._buf = ""
+        self._first_sent = False
+        self._first_text_at = None
+        self._segment_id = utils.shortuuid()
+
+    def end_input(self) -> None:
+        self.flush()
+        self._do_close()
+
+    async def aclose(self) -> None:
+        self._do_close()
+
+    def _send(self, chunk: str) -> None:
+        chunk = chunk.strip()
+        if not chunk:
+            return
+
+        if not self._first_sent:
+            self._first_sent = True
+            if self._first_text_at is not None:
+                self.first_chunk_delay = time.perf_counter() - self._first_text_at
+                logger.debug(
+                    f"First chunk after {self.first_chunk_delay * 1000:.0f}ms: {chunk!r}"
+                )
+
+        self._event_ch.send_nowait(
+            tokenize.TokenData(segment_id=self._segment_id, token=chunk)
+        )
+
+
+class ClauseTokenizer(tokenize.SentenceTokenizer):
+    """Drop-in tokenizer for cartesia.TTS(tokenizer=...)"""
+
+    def __init__(self, *, min_first_chunk_len: int = 8, min_chunk_len: int = 40):
+        self._min_first_chunk_len = min_first_chunk_len
+        self._min_chunk_len = min_chunk_len
+
+    def tokenize(self, text: str, *, language: Optional[str] = None) -> list[str]:
+        return split_clauses(text, self._min_first_chunk_len, self._min_chunk_len)
+
+    def stream(self, *, language: Optional[str] = None) -> ClauseStream:
+        return ClauseStream(
+            min_first_chunk_len=self._min_first_chunk_len,
+            min_chunk_len=self._min_chunk_len,
+        )
+
+
+class TurnLatencyTracker:
+    """
+    Log time-to-first-audio per agent turn
+
+    Time-to-first-audio is the LLM time-to-first-token plus the time from the
+    first LLM text delta to the first audio frame reaching the room output. The
+    second part covers the wait for the tokenizer to release its first chunk
+    (what ClauseTokenizer shortens) and the TTS time-to-first-byte; TTSMetrics
+    alone starts its clock only when the first chunk is sent. The chunking mode
+    is included in every log line so clause and default segmentation can be
+    compared per turn.
+    """
+
+    def __init__(self, chunking_mode: str):
+        self.chunking_mode = chunking_mode
+        self.turns: list[float] = []
+        self.session: Optional[AgentSession] = None
+        self._first_delta_at: Optional[float] = None
+        self._text_to_audio: dict[str, float] = {}  # speech_id -> first delta -> first audio
+        self._llm_ttft: dict[str, float] = {}
+
+    def attach(self, session: AgentSession) -> None:
+        self.session = session
+        session.on("agent_state_changed", self.on_agent_state)
+        session.on("metrics_collected", self.on_metrics)
+
+    async def track_generation(self, stream: AsyncIterable) -> AsyncIterable:
+        """Pass llm_node output through, timestamping the first text delta"""
+        async for chunk in stream:
+            if self._first_delta_at is None:
+                text = chunk.delta.content if isinstance(chunk, llm.ChatChunk) and chunk.delta else chunk
+                if isinstance(text, str) and text:
+                    self._first_delta_at = time.perf_counter()
+            yield chunk
+
+    def on_agent_state(self, ev) -> None:
+        if ev.new_state == "speaking" and self._first_delta_at is not None:
+            speech = self.session.current_speech if self.session else None
+            if speech is not None:
+                self._text_to_audio[speech.id] = time.perf_counter() - self._first_delta_at
+                self._log_turn(speech.id)
+        if ev.new_state in ("speaking", "listening"):
+            # Scripted speech (session.say) never has an LLM delta pending
+            self._first_delta_at = None
+
+    def on_metrics(self, ev) -> None:
+        m = ev.metrics
+        if isinstance(m, metrics.LLMMetrics) and m.speech_id and m.ttft >= 0:
+            self._llm_ttft[m.speech_id] = m.ttft
+            self._log_turn(m.speech_id)
+
+    def _log_turn(self, speech_id: str) -> None:
+        # LLM metrics arrive when the stream ends, usually after the first audio
+        if speech_id not in self._llm_ttft or speech_id not in self._text_to_audio:
+            return
+        ttft = self._llm_ttft.pop(speech_id)
+        text_to_audio = self._text_to_audio.pop(speech_id)
+
+        first_audio = ttft + text_to_audio
+        self.turns.append(first_audio)
+        logger.info(
+            f"[{self.chunking_mode}] turn {len(self.turns)}: "
+            f"time-to-first-audio={first_audio * 1000:.0f}ms "
+            f"(llm_ttft={ttft * 1000:.0f}ms, "
+            f"first_text_to_audio={text_to_audio * 1000:.0f}ms)"
+        )
+
+    def summary(self) -> str:
+        if not self.turns:
+            return f"[{self.chunking_mode}] no LLM turns recorded"
+        avg = sum(self.turns) / len(self.turns)
+        return (
+            f"[{self.chunking_mode}] {len(self.turns)} turns, "
+            f"avg time-to-first-audio={avg * 1000:.0f}ms, "
+            f"worst={max(self.turns) * 1000:.0f}ms"
+        )
@@ -1,13 +1,33 @@
 #!/usr/bin/env python3
 """
 Setup verification script for debt collection voice agent
+
+Usage:
+    python verify_setup.py                          # env, credentials, imports
+    python verify_setup.py --preflight [samples]    # + endpoint latency probes
 """
 
+import asyncio
 import os
+import ssl
+import statistics
 import sys
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlparse
 
 from dotenv import load_dotenv
 
+# Default latency budgets (median ms per sample: connect + TLS + first byte)
+DEFAULT_BUDGETS_MS = {
+    "livekit": 600,
+    "sip": 400,
+    "deepgram": 700,
+    "openai": 800,
+    "cartesia": 700,
+}
+
 
 def check_env_file():
     """Check if .env file exists"""
@@ -69,10 +89,184 @@ def check_imports():
     return True
 
 
+@dataclass
+class Endpoint:
+    name: str
+    url: str  # https:// (TLS + HTTP), http://, tls:// (handshake only) or tcp://
+    budget_ms: float
+
+
+@dataclass
+class ProbeResult:
+    endpoint: Endpoint
+    connect_ms: list = field(default_factory=list)
+    tls_ms: list = field(default_factory=list)
+    first_byte_ms: list = field(default_factory=list)
+    total_ms: list = field(default_factory=list)  # connect + TLS + first byte, per sample
+    errors: list = field(default_factory=list)
+
+    def median(self, stage: str) -> Optional[float]:
+        values = getattr(self, stage)
+        return statistics.median(values) if values else None
+
+    @property
+    def measured_ms(self) -> Optional[float]:
+        """Median total time over all stages this endpoint was probed for"""
+        return self.median("total_ms")
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors and self.measured_ms is not None and (
+            self.measured_ms <= self.endpoint.budget_ms
+        )
+
+
+def sip_probe_url() -> Optional[str]:
+    """SIP over TLS URL from LIVEKIT_SIP_URI (project settings, e.g. sip:xxxx.sip.livekit.cloud)"""
+    uri = os.getenv("LIVEKIT_SIP_URI", "").strip()
+    if not uri:
+        return None
+    host = uri.split(":", 1)[1] if uri.lower().startswith(("sip:", "sips:")) else uri
+    host = host.split(";", 1)[0].split(":", 1)[0]  # drop URI parameters and port
+    # SIP servers don't speak first, so this is connect + TLS only
+    return f"tls://{host}:5061"
+
+
+def preflight_endpoints() -> list[Endpoint]:
+    """
+    Endpoints used under load, overridable with PREFLIGHT_<NAME>_URL. SIP is
+    left out unless LIVEKIT_SIP_URI or PREFLIGHT_SIP_URL is set
+    """
+    livekit = urlparse(os.getenv("LIVEKIT_URL", "wss://localhost"))
+    livekit_host = livekit.hostname or "localhost"
+    defaults = {
+        "livekit": f"https://{livekit_host}",
+        "sip": sip_probe_url(),
+        "deepgram": "https://api.deepgram.com",
+        "openai": "https://api.openai.com",
+        "cartesia": "https://api.cartesia.ai",
+    }
+
+    endpoints = []
+    for name, url in defaults.items():
+        key = name.upper()
+        url = os.getenv(f"PREFLIGHT_{key}_URL", url)
+        if not url:
+            continue
+        budget = float(os.getenv(f"PREFLIGHT_{key}_BUDGET_MS", DEFAULT_BUDGETS_MS[name]))
+        endpoints.append(Endpoint(name, url, budget))
+    return endpoints
+
+
+class _FirstByteProtocol(asyncio.Protocol):
+    def __init__(self):
+        self.first_byte: asyncio.Future = asyncio.get_running_loop().create_future()
+        # Connect-only probes never await this; mark a close error as retrieved
+        self.first_byte.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+    def data_received(self, data: bytes) -> None:
+        if not self.first_byte.done():
+            self.first_byte.set_result(time.perf_counter())
+
+    def connection_lost(self, exc) -> None:
+        if not self.first_byte.done():
+            self.first_byte.set_exception(exc or ConnectionError("closed before first byte"))
+
+
+async def probe_once(endpoint: Endpoint, result: ProbeResult, timeout: float) -> None:
+    """One sample: TCP connect, then TLS handshake, then request to first byte"""
+    url = urlparse(endpoint.url)
+    use_tls = url.scheme in ("https", "tls")
+    default_port = {"https": 443, "tls": 443, "http": 80}.get(url.scheme, 80)
+    host, port = url.hostname, url.port or default_port
+    loop = asyncio.get_running_loop()
+
+    start = time.perf_counter()
+    transport, protocol = await asyncio.wait_for(
+        loop.create_connection(_FirstByteProtocol, host, port), timeout
+    )
+    try:
+        connected = time.perf_counter()
+        result.connect_ms.append((connected - start) * 1000)
+
+        if use_tls:
+            ctx = ssl.create_default_context()
+            if os.getenv("PREFLIGHT_INSECURE") == "1":  # self-signed local stand-ins
+                ctx.check_hostname = False
+                ctx.verify_mode = ssl.CERT_NONE
+            transport = await asyncio.wait_for(
+                loop.start_tls(transport, protocol, ctx, server_hostname=host), timeout
+            )
+            connected = time.perf_counter()
+            result.tls_ms.append((connected - start) * 1000 - result.connect_ms[-1])
+
+        if url.scheme in ("https", "http"):
+            transport.write(
+                f"HEAD {url.path or '/'} HTTP/1.1\r\nHost: {host}\r\n"
+                "Connection: close\r\n\r\n".encode()
+            )
+            first_byte = await asyncio.wait_for(protocol.first_byte, timeout)
+            result.first_byte_ms.append((first_byte - connected) * 1000)
+            connected = first_byte
+
+        result.total_ms.append((connected - start) * 1000)
+    finally:
+        transport.close()
+
+
+async def probe_endpoint(endpoint: Endpoint, samples: int, timeout: float) -> ProbeResult:
+    result = ProbeResult(endpoint)
+    for _ in range(samples):
+        try:
+            await probe_once(endpoint, result, timeout)
+        except (OSError, ssl.SSLError, asyncio.TimeoutError) as e:
+            result.errors.append(f"{type(e).__name__}: {e}")
+    return result
+
+
+async def run_preflight(
+    endpoints: list[Endpoint], samples: int = 5, timeout: float = 5.0
+) -> list[ProbeResult]:
+    """Probe every endpoint concurrently (samples per endpoint run in sequence)"""
+    return await asyncio.gather(*(probe_endpoint(e, samples, timeout) for e in endpoints))
+
+
+def check_preflight(samples: int = 5) -> bool:
+    """Print a latency table and return False if any endpoint breaches its budget"""
+    print(f"\n📡 Probing endpoints ({samples} samples each)...")
+    endpoints = preflight_endpoints()
+    results = asyncio.run(run_preflight(endpoints, samples))
+
+    def fmt(value: Optional[float]) -> str:
+        return f"{value:.0f}" if value is not None else "-"
+
+    print(f"   {'endpoint':<10}{'connect':>9}{'tls':>7}{'ttfb':>7}{'total':>8}{'budget':>8}")
+    for r in results:
+        status = "✅" if r.ok else "❌"
+        print(
+            f"{status} {r.endpoint.name:<10}{fmt(r.median('connect_ms')):>9}"
+            f"{fmt(r.median('tls_ms')):>7}{fmt(r.median('first_byte_ms')):>7}"
+            f"{fmt(r.measured_ms):>8}{r.endpoint.budget_ms:>8.0f}"
+        )
+        for error in sorted(set(r.errors)):
+            print(f"   → {error}")
+    if "sip" not in {e.name for e in endpoints}:
+        print("⏭️  sip: skipped, set LIVEKIT_SIP_URI (SIP URI from the LiveKit project settings)")
+
+    return all(r.ok for r in results)
+
+
 def main():
     print("🔍 Verifying debt collection agent setup...\n")
 
     checks = [check_env_file(), check_credentials(), check_imports()]
+    if "--preflight" in sys.argv:
+        index = sys.argv.index("--preflight")
+        samples = sys.argv[index + 1] if len(sys.argv) > index + 1 else "5"
+        if not samples.isdigit() or int(samples) < 1:
+            print(f"❌ --preflight takes a number of samples, got '{samples}'")
+            sys.exit(1)
+        checks.append(check_preflight(int(samples)))
 
     if all(checks):
         print("\n🎉 Setup verification complete! Ready to test the agent.")
@@ -0,0 +1,351 @@
+"""
+Early answering-machine / voicemail detection for outbound calls.
+
+wait_until_answered=True treats a voicemail pickup as answered, so without this
+the whole STT/LLM/TTS pipeline would talk to a greeting. The detector runs
+locally on the first seconds of callee audio, before the agent session starts:
+
+- a sustained pure tone (the record beep) means a machine
+- an utterance longer than a human "Hello?", or more speech than a human says
+  before waiting for a reply, means a machine greeting
+- short utterances followed by silence mean a human waiting for a reply
+
+A pause longer than max_gap ends an utterance, so "Hello? ... Hello?" counts
+as two short utterances, not one long greeting.
+
+Speech is judged against an adaptive noise floor, not only a fixed level: a
+callee in a car or on a street has background noise louder than speech_db, and
+a fixed gate would hear one endless utterance there and call it a machine.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import wave
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from livekit import api, rtc
+from livekit.agents import JobContext
+
+logger = logging.getLogger("voicemail-detector")
+
+HUMAN = "human"
+MACHINE = "machine"
+UNKNOWN = "unknown"
+
+
+@dataclass
+class DetectorConfig:
+    sample_rate: int = 16000
+    frame_ms: int = 20
+    speech_db: float = -40.0  # frame RMS (dBFS) below which nothing counts as speech
+    noise_margin_db: float = 8.0  # speech must also be this far above the noise floor
+    noise_rise_db: float = 1.0  # dB per second the noise floor may rise; it falls instantly
+    max_human_greeting: float = 2.2  # seconds of one continuous utterance before "machine"
+    max_human_speech: float = 3.6  # total speech without a reply pause before "machine"
+    human_silence: float = 0.8  # silence after a short greeting that means "human"
+    max_gap: float = 0.25  # gaps shorter than this don't end an utterance
+    initial_silence: float = 4.0  # nobody spoke at all
+    beep_min_hz: float = 350.0
+    beep_max_hz: float = 2500.0
+    beep_min_duration: float = 0.18
+    beep_tonality: float = 0.6  # share of frame energy in the peak FFT bins
+    timeout: float = 6.0
+    record_silence: float = 1.5  # silence after a machine greeting that means no beep is coming
+    record_timeout: float = 30.0  # max wait for the beep or the end of a machine greeting
+
+
+@dataclass
+class DetectionResult:
+    verdict: str
+    reason: str
+    audio_seconds: float  # callee audio consumed before the decision
+    greeting_seconds: float  # longest continuous utterance
+
+
+class VoicemailDetector:
+    """Frame-by-frame classifier, fed with 16-bit mono PCM"""
+
+    def __init__(self, config: Optional[DetectorConfig] = None):
+        self.config = config or DetectorConfig()
+        self._frame_len = self.config.sample_rate * self.config.frame_ms // 1000
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._window = np.hanning(self._frame_len)
+        self._freqs = np.fft.rfftfreq(self._frame_len, 1 / self.config.sample_rate)
+
+        self._elapsed = 0.0
+        self._speech_started: Optional[float] = None  # start of the current utterance
+        self._last_speech: Optional[float] = None
+        self._longest = 0.0  # longest finished utterance
+        self._speech_seconds = 0.0
+        self._beep_frames = 0
+        self._beep_hz: Optional[float] = None
+        self._noise_floor: Optional[float] = None  # dBFS, tracks the quietest recent frames
+        self.result: Optional[DetectionResult] = None
+
+    def push(self, samples: np.ndarray) -> Optional[DetectionResult]:
+        """Feed samples; returns the result as soon as a decision is reached"""
+        if self.result:
+            return self.result
+
+        self._pending = np.concatenate([self._pending, samples.astype(np.int16)])
+        while len(self._pending) >= self._frame_len and not self.result:
+            frame = self._pending[: self._frame_len]
+            self._pending = self._pending[self._frame_len :]
+            self._process_frame(frame)
+        return self.result
+
+    def finish(self) -> DetectionResult:
+        """Decide with whatever audio was seen (stream ended or timed out)"""
+        if not self.result:
+            if self._speech_started is None:
+                self._decide(UNKNOWN, "no speech detected")
+            elif (
+                self._greeting_length() <= self.config.max_human_greeting
+                and self._speech_seconds <= self.config.max_human_speech
+            ):
+                self._decide(HUMAN, "short greeting before the audio ended")
+            else:
+                self._decide(MACHINE, "long greeting before the audio ended")
+        return self.result
+
+    def _process_frame(self, frame: np.ndarray) -> None:
+        cfg = self.config
+        frame_s = cfg.frame_ms / 1000
+        self._elapsed += frame_s
+
+        is_speech, is_tone = self._classify(frame)
+        if is_tone:
+            self._beep_frames += 1
+            if self._beep_frames * frame_s >= cfg.beep_min_duration:
+                self._decide(MACHINE, f"beep at {self._beep_hz:.0f}Hz")
+                return
+        else:
+            self._beep_frames = 0
+
+        if is_speech:
+            if self._speech_started is None:
+                self._speech_started = self._elapsed
+                self._speech_seconds += frame_s
+            elif self._elapsed - self._last_speech > cfg.max_gap:
+                # A real pause ends the utterance ("Hello? ... Hello?")
+                self._longest = max(self._longest, self._utterance_length())
+                self._speech_started = self._elapsed
+                self._speech_seconds += frame_s
+            else:
+                # Syllable dips inside an utterance count as speech, also when
+                # background noise masks them
+                self._speech_seconds += self._elapsed - self._last_speech
+            self._last_speech = self._elapsed
+
+            if self._utterance_length() > cfg.max_human_greeting:
+                self._decide(MACHINE, "greeting longer than a human hello")
+            elif self._speech_seconds > cfg.max_human_speech:
+                self._decide(MACHINE, "kept talking without waiting for a reply")
+            return
+
+        if self._speech_started is None:
+            if self._elapsed >= cfg.initial_silence:
+                self._decide(UNKNOWN, "callee stayed silent")
+            return
+
+        silence = self._elapsed - self._last_speech
+        if silence >= cfg.human_silence:
+            self._decide(HUMAN, "short greeting followed by silence")
+
+    def _classify(self, frame: np.ndarray) -> tuple[bool, bool]:
+        """(is_speech, is_tone) for one frame; speech must stand out of the background"""
+        cfg = self.config
+        x = frame.astype(np.float32) / 32768.0
+        rms = float(np.sqrt(np.mean(x * x))) + 1e-9
+        db = 20 * np.log10(rms)
+
+        # Minimum tracking: speech pauses pull the floor down to the background
+        # level, the slow rise follows louder backgrounds without chasing speech
+        if self._noise_floor is None or db < self._noise_floor:
+            self._noise_floor = db
+        else:
+            self._noise_floor += cfg.noise_rise_db * cfg.frame_ms / 1000
+
+        is_speech = db > max(cfg.speech_db, self._noise_floor + cfg.noise_margin_db)
+        return is_speech, is_speech and self._is_tone(x)
+
+    def _is_tone(self, x: np.ndarray) -> bool:
+        cfg = self.config
+        spectrum = np.abs(np.fft.rfft(x * self._window)) ** 2
+        total = float(spectrum.sum()) + 1e-12
+        peak = int(np.argmax(spectrum))
+        peak_energy = float(spectrum[max(peak - 2, 0) : peak + 3].sum())
+        hz = float(self._freqs[peak])
+
+        if not cfg.beep_min_hz <= hz <= cfg.beep_max_hz:
+            return False
+        if peak_energy / total < cfg.beep_tonality:
+            return False
+        if self._beep_frames and self._beep_hz and abs(hz - self._beep_hz) > 60:
+            return False  # a beep holds its pitch, speech formants don't
+        self._beep_hz = hz
+        return True
+
+    def _utterance_length(self) -> float:
+        if self._speech_started is None:
+            return 0.0
+        return self._last_speech - self._speech_started + self.config.frame_ms / 1000
+
+    def _greeting_length(self) -> float:
+        return max(self._longest, self._utterance_length())
+
+    def _decide(self, verdict: str, reason: str) -> None:
+        self.result = DetectionResult(
+            verdict=verdict,
+            reason=reason,
+            audio_seconds=round(self._elapsed, 3),
+            greeting_seconds=round(self._greeting_length(), 3),
+        )
+
+
+class RecordStartDetector(VoicemailDetector):
+    """
+    After a machine verdict: detects when the machine starts recording, i.e.
+    the end of the record beep, or silence after the greeting if there is none
+    """
+
+    def __init__(self, config: Optional[DetectorConfig] = None, in_beep: bool = False):
+        super().__init__(config)
+        self._in_beep = in_beep  # the verdict was the beep itself, still playing
+
+    def _process_frame(self, frame: np.ndarray) -> None:
+        cfg = self.config
+        frame_s = cfg.frame_ms / 1000
+        self._elapsed += frame_s
+
+        is_speech, is_tone = self._classify(frame)
+        if is_tone:
+            self._beep_frames += 1
+            if self._beep_frames * frame_s >= cfg.beep_min_duration:
+                self._in_beep = True
+            return
+        self._beep_frames = 0
+
+        if self._in_beep:
+            self._decide(MACHINE, f"beep ended at {self._beep_hz or 0:.0f}Hz")
+        elif is_speech or self._last_speech is None:
+            self._last_speech = self._elapsed
+        elif self._elapsed - self._last_speech >= cfg.record_silence:
+            self._decide(MACHINE, "greeting ended without a beep")
+
+
+async def _listen(
+    participant: rtc.RemoteParticipant, detector: VoicemailDetector, timeout: float
+) -> None:
+    """Feed the callee's audio to the detector until it decides or the timeout passes"""
+    stream = rtc.AudioStream.from_participant(
+        participant=participant,
+        track_source=rtc.TrackSource.SOURCE_MICROPHONE,
+        sample_rate=detector.config.sample_rate,
+        num_channels=1,
+    )
+
+    async def listen() -> None:
+        async for ev in stream:
+            samples = np.frombuffer(ev.frame.data, dtype=np.int16)
+            if detector.push(samples):
+                return
+
+    try:
+        await asyncio.wait_for(listen(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        await stream.aclose()
+
+
+async def detect_voicemail(
+    participant: rtc.RemoteParticipant, config: Optional[DetectorConfig] = None
+) -> DetectionResult:
+    """Listen to the callee's first seconds of audio and classify the pickup"""
+    detector = VoicemailDetector(config)
+    started = time.perf_counter()
+    await _listen(participant, detector, detector.config.timeout)
+
+    result = detector.finish()
+    logger.info(
+        f"Voicemail detection: {result.verdict} ({result.reason}) after "
+        f"{result.audio_seconds:.2f}s of audio, "
+        f"{time.perf_counter() - started:.2f}s wall clock"
+    )
+    return result
+
+
+async def wait_for_recording(
+    participant: rtc.RemoteParticipant,
+    detection: DetectionResult,
+    config: Optional[DetectorConfig] = None,
+) -> bool:
+    """Wait until the machine is recording; False if it never was within record_timeout"""
+    detector = RecordStartDetector(config, in_beep=detection.reason.startswith("beep"))
+    await _listen(participant, detector, detector.config.record_timeout)
+    if not detector.result:
+        return False
+    logger.info(f"Machine recording: {detector.result.reason} after {detector.result.audio_seconds:.2f}s")
+    return True
+
+
+async def play_wav(room: rtc.Room, wav_path: str) -> None:
+    """Publish a pre-rendered 16-bit mono WAV message and wait for it to play out"""
+    with wave.open(wav_path, "rb") as wav:
+        sample_rate = wav.getframerate()
+        pcm = wav.readframes(wav.getnframes())
+
+    source = rtc.AudioSource(sample_rate, 1)
+    track = rtc.LocalAudioTrack.create_audio_track("voicemail-message", source)
+    publication = await room.local_participant.publish_track(
+        track, rtc.TrackPublishOptions(source=rtc.TrackSource.SOURCE_MICROPHONE)
+    )
+
+    samples_per_frame = sample_rate // 50  # 20ms frames
+    bytes_per_frame = samples_per_frame * 2
+    try:
+        for i in range(0, len(pcm), bytes_per_frame):
+            chunk = pcm[i : i + bytes_per_frame]
+            await source.capture_frame(
+                rtc.AudioFrame(
+                    data=chunk,
+                    sample_rate=sample_rate,
+                    num_channels=1,
+                    samples_per_channel=len(chunk) // 2,
+                )
+            )
+        await source.wait_for_playout()
+    finally:
+        await room.local_participant.unpublish_track(publication.sid)
+
+
+async def leave_message_and_hang_up(
+    ctx: JobContext,
+    participant: rtc.RemoteParticipant,
+    detection: DetectionResult,
+    message_path: Optional[str] = None,
+) -> None:
+    """Optionally leave a pre-rendered message once recording starts, then drop the SIP leg and the job"""
+    if message_path and os.path.exists(message_path):
+        try:
+            if await wait_for_recording(participant, detection):
+                await play_wav(ctx.room, message_path)
+                logger.info(f"Left voicemail message: {message_path}")
+            else:
+                logger.warning("Machine never started recording, skipping voicemail message")
+        except Exception as e:
+            logger.error(f"Failed to play voicemail message: {e}")
+
+    try:
+        await ctx.api.room.remove_participant(
+            api.RoomParticipantIdentity(room=ctx.room.name, identity=participant.identity)
+        )
+    except api.TwirpError as e:
+        logger.error(f"Error hanging up on voicemail: {e.message}")
+
+    ctx.shutdown(reason="voicemail")